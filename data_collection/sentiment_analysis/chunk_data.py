@@ -1,3 +1,4 @@
+import argparse
 import json
 import os
 from datetime import datetime
@@ -6,6 +7,7 @@ import pandas as pd
 from pathlib import Path
 
 from preprocessing.utils import load_json_file, load_reddit_data, save_chunks
+from ipl_sentiment_betting.utils.profiling import NULL_PROFILER, Profiler
 
 # Constants for datetime formats
 TIMESTAMP_FORMAT_Z = "%Y-%m-%dT%H:%M:%SZ"
@@ -129,7 +131,45 @@ def create_chunks(
     return chunks
 
 
+def process_matches(odds_dir, ball_by_ball_dir, reddit_dir, output_dir, profiler=NULL_PROFILER):
+    # Process each odds file sequentially in ascending order
+    for odds_file in sorted(odds_dir.glob("*.json")):
+        match_id = odds_file.stem
+        print(f"Processing match {match_id}...")
+
+        with profiler.interval(f"match_{match_id}"):
+            # Load data
+            with profiler.stage("load"):
+                odds_data = load_json_file(str(odds_file))
+                ball_by_ball_file = ball_by_ball_dir / f"{match_id}.json"
+                ball_by_ball = load_json_file(str(ball_by_ball_file))
+                reddit_comments_file = reddit_dir / f"{match_id}.csv"
+                reddit_comments_df = load_reddit_data(str(reddit_comments_file))
+
+            if not odds_data or not ball_by_ball or reddit_comments_df.empty:
+                print(f"Skipping match {match_id} due to missing data.")
+                continue
+
+            # Create chunks
+            with profiler.stage("chunk"):
+                reddit_comments = reddit_comments_df.to_dict('records')
+                chunks = create_chunks(match_id, odds_data, ball_by_ball, reddit_comments)
+
+            # Save chunks
+            with profiler.stage("save"):
+                output_path = output_dir / f"{match_id}.json"
+                save_chunks(chunks, str(output_path))
+            print(f"Finished processing match {match_id}")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Split each match's odds, balls and comments into chunks.")
+    parser.add_argument("--profile", type=str, nargs="?", const="profile", default=None, metavar="DIR",
+                        help="Profile the run (CPU per stage, peak memory per match, flame-graph stacks) and write the results to DIR (default: profile/).")
+    parser.add_argument("--profile-top", type=int, default=25, help="Functions and allocation sites listed in the profile report (default: 25).")
+    parser.add_argument("--profile-no-memory", action="store_true", help="With --profile, skip memory tracing, which inflates stage times.")
+    args = parser.parse_args()
+
     base_dir = Path(".")
     odds_dir = base_dir / "preprocessing" / "the_odds_api" / "2024_trimmed"
     ball_by_ball_dir = base_dir / "preprocessing" / "sportmonks" / "2024_enhanced"
@@ -139,31 +179,16 @@ def main():
     # Create output directory if it doesn't exist
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Process each odds file sequentially in ascending order
-    for odds_file in sorted(odds_dir.glob("*.json")):
-        match_id = odds_file.stem
-        print(f"Processing match {match_id}...")
-
-        # Load data
-        odds_data = load_json_file(str(odds_file))
-        ball_by_ball_file = ball_by_ball_dir / f"{match_id}.json"
-        ball_by_ball = load_json_file(str(ball_by_ball_file))
-        reddit_comments_file = reddit_dir / f"{match_id}.csv"
-        reddit_comments_df = load_reddit_data(str(reddit_comments_file))
-
-        if not odds_data or not ball_by_ball or reddit_comments_df.empty:
-            print(f"Skipping match {match_id} due to missing data.")
-            continue
-
-        reddit_comments = reddit_comments_df.to_dict('records')
-
-        # Create chunks
-        chunks = create_chunks(match_id, odds_data, ball_by_ball, reddit_comments)
+    if not args.profile:
+        process_matches(odds_dir, ball_by_ball_dir, reddit_dir, output_dir)
+        return
 
-        # Save chunks
-        output_path = output_dir / f"{match_id}.json"
-        save_chunks(chunks, str(output_path))
-        print(f"Finished processing match {match_id}")
+    profiler = Profiler(args.profile, top_n=args.profile_top, trace_memory=not args.profile_no_memory)
+    with profiler:
+        process_matches(odds_dir, ball_by_ball_dir, reddit_dir, output_dir, profiler)
+    profiler.write()
+    print(f"\n{profiler.stage_summary()}")
+    print(f"Profile written to {args.profile}/ (report.txt, stacks.collapsed, one .prof per stage)")
 
 
 if __name__ == "__main__":
@@ -1,9 +1,10 @@
 import requests
-import json
 import os
 import time
 from pathlib import Path
 
+from ipl_sentiment_betting.utils import codec
+
 API_TOKEN = os.getenv("SPORTMONKS_API_TOKEN")
 if not API_TOKEN:
     raise ValueError("Please set SPORTMONKS_API_TOKEN environment variable")
@@ -12,12 +13,15 @@ BASE_URL = "https://cricket.sportmonks.com/api/v2.0"
 
 
 def fetch_match_data(fixture_id):
+    """Fetches a fixture with its balls, returning the raw (compact) JSON body."""
     url = f"{BASE_URL}/fixtures/{fixture_id}"
     params = {"api_token": API_TOKEN, "include": "balls"}
 
     response = requests.get(url, params=params)
     response.raise_for_status()
-    return response.json()
+    # Validate the shape trim.py relies on before anything is saved.
+    codec.decode(response.content, codec.FixtureResponse)
+    return response.content
 
 
 def main():
@@ -41,8 +45,8 @@ def main():
             print(f"Fetching data for fixture {fixture_id}")
             data = fetch_match_data(fixture_id)
 
-            with open(output_file, "w") as f:
-                json.dump(data, f, indent=2)
+            with open(output_file, "wb") as f:
+                f.write(data)
 
             print(f"Saved data for fixture {fixture_id}")
             time.sleep(1)  # Rate limiting
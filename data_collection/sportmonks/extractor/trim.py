@@ -1,66 +1,46 @@
-import json
 import os
-from typing import Dict
 
+from ipl_sentiment_betting.utils import codec
 
-def extract_summary(data: Dict) -> Dict:
+
+def extract_summary(fixture: codec.Fixture) -> codec.MatchSummary:
     """Extract summary information from match data."""
-    return {
-        "id": data["data"]["id"],
-        "round": data["data"]["round"],
-        "localteam_id": data["data"]["localteam_id"],
-        "visitorteam_id": data["data"]["visitorteam_id"],
-        "starting_at": data["data"]["starting_at"],
-        "note": data["data"]["note"],
-        "venue_id": data["data"]["venue_id"],
-        "toss_won_team_id": data["data"]["toss_won_team_id"],
-        "winner_team_id": data["data"]["winner_team_id"],
-    }
-
-
-def extract_ball_info(ball: Dict) -> Dict:
+    return codec.MatchSummary(
+        id=fixture.id,
+        round=fixture.round,
+        localteam_id=fixture.localteam_id,
+        visitorteam_id=fixture.visitorteam_id,
+        starting_at=fixture.starting_at,
+        note=fixture.note,
+        venue_id=fixture.venue_id,
+        toss_won_team_id=fixture.toss_won_team_id,
+        winner_team_id=fixture.winner_team_id,
+    )
+
+
+def extract_ball_info(ball: codec.FixtureBall) -> codec.BallEvent:
     """Extract information for a single ball."""
-    return {
-        "ball": ball["ball"],
-        "updated_at": ball["updated_at"],
-        "id": ball["team"]["id"],
-        "name": ball["team"]["name"],
-        "score": {
-            "name": ball["score"]["name"],
-            "runs": ball["score"]["runs"],
-            "four": ball["score"]["four"],
-            "six": ball["score"]["six"],
-            "bye": ball["score"]["bye"],
-            "leg_bye": ball["score"]["leg_bye"],
-            "is_wicket": ball["score"]["is_wicket"],
-            "ball": ball["score"]["ball"],
-            "out": ball["score"]["out"],
-        },
-        "batsman": {
-            "id": ball["batsman"]["id"],
-            "fullname": ball["batsman"]["fullname"],
-            "battingstyle": ball["batsman"]["battingstyle"],
-        },
-        "bowler": {
-            "id": ball["bowler"]["id"],
-            "fullname": ball["bowler"]["fullname"],
-            "bowlingstyle": ball["bowler"]["bowlingstyle"],
-        },
-    }
+    return codec.BallEvent(
+        ball=ball.ball,
+        updated_at=ball.updated_at,
+        id=ball.team.id,
+        name=ball.team.name,
+        score=ball.score,
+        batsman=ball.batsman,
+        bowler=ball.bowler,
+    )
 
 
 def process_match_data(input_path: str, output_path: str) -> None:
     """Process a single match JSON file and save trimmed data."""
-    with open(input_path, "r") as file:
-        data = json.load(file)
+    fixture = codec.read_json(input_path, codec.FixtureResponse).data
 
-    summary = extract_summary(data)
-    balls_data = [extract_ball_info(ball) for ball in data["data"]["balls"]]
+    summary = extract_summary(fixture)
+    balls_data = [extract_ball_info(ball) for ball in fixture.balls]
 
-    output_data = {"summary": summary, "balls": balls_data}
+    output_data = codec.BallsFile(summary=summary, balls=balls_data)
 
-    with open(output_path, "w") as outfile:
-        json.dump(output_data, outfile, indent=4)
+    codec.write_json(output_path, output_data)
 
 
 def main():
@@ -1,25 +1,27 @@
-import json
 import pandas as pd
 from typing import Any, Dict, List
 
-def load_json_file(file_path: str) -> Dict[str, Any]:
+from ipl_sentiment_betting.utils import codec
+
+def load_json_file(file_path: str, schema: Any = Any) -> Any:
     """
     Load a JSON file.
 
     Args:
         file_path (str): The path to the JSON file.
+        schema (Any): Optional schema from ipl_sentiment_betting.utils.codec
+            (e.g. codec.OddsFile) to validate against while decoding.
 
     Returns:
-        Dict[str, Any]: The content of the JSON file.
+        Any: The content of the JSON file, typed per schema if one is given.
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return codec.read_json(file_path, schema)
     except FileNotFoundError:
         print(f"Error: File not found at {file_path}")
         return {}
-    except json.JSONDecodeError:
-        print(f"Error: Could not decode JSON from {file_path}")
+    except codec.DecodeError as e:
+        print(f"Error: Could not decode JSON from {file_path}: {e}")
         return {}
 
 def load_reddit_data(file_path: str) -> pd.DataFrame:
@@ -40,14 +42,13 @@ def load_reddit_data(file_path: str) -> pd.DataFrame:
 
 def save_chunks(data: Dict[str, Any], file_path: str) -> None:
     """
-    Save data chunks to a JSON file.
+    Save data chunks to a compact JSON file.
 
     Args:
         data (Dict[str, Any]): The data to save.
         file_path (str): The path to the output JSON file.
     """
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
-    except IOError as e:
-        print(f"Error saving file {file_path}: {e}") 
\ No newline at end of file
+        codec.write_json(file_path, data)
+    except (IOError, TypeError) as e:
+        print(f"Error saving file {file_path}: {e}") 
@@ -0,0 +1,349 @@
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ipl_sentiment_betting.analysis.metrics import (
+    compute_ball_metrics, compute_sentiment_stats, is_scorable, odds_for_teams, team_key
+)
+from ipl_sentiment_betting.analysis.sentiment import SentimentAnalyzer
+from ipl_sentiment_betting.core.records import Match, load_match
+
+# Column name -> SQLite type, in table order. (match_id, chunk_index) is the key.
+FEATURE_COLUMNS: Dict[str, str] = {
+    "match_id": "TEXT",
+    "chunk_index": "INTEGER",
+    "chunk_name": "TEXT",
+    "start_time": "INTEGER",
+    "end_time": "INTEGER",
+    "is_pregame": "INTEGER",
+    "is_innings_break": "INTEGER",
+    "team1": "TEXT",
+    "team2": "TEXT",
+    "batting_team": "TEXT",
+    "last_over": "INTEGER",
+    "runs": "INTEGER",
+    "valid_balls": "INTEGER",
+    "wickets": "INTEGER",
+    "fours": "INTEGER",
+    "sixes": "INTEGER",
+    "wides": "INTEGER",
+    "dots": "INTEGER",
+    "run_rate": "REAL",
+    "dot_pct": "REAL",
+    "boundary_pct": "REAL",
+    "partnership_runs": "INTEGER",
+    "comment_count": "INTEGER",
+    "sentiment_avg": "REAL",
+    "sentiment_weighted": "REAL",
+    "sentiment_positive": "INTEGER",
+    "sentiment_negative": "INTEGER",
+    "sentiment_neutral": "INTEGER",
+    "team1_price": "REAL",
+    "team2_price": "REAL",
+    "team1_price_delta": "REAL",
+    "team2_price_delta": "REAL",
+    "batting_price": "REAL",
+    "batting_price_delta": "REAL",
+}
+
+# Columns research queries filter or sort on.
+INDEXED_COLUMNS = (
+    "start_time", "run_rate", "dot_pct", "boundary_pct", "wickets",
+    "sentiment_avg", "sentiment_weighted", "batting_price_delta",
+    "team1_price_delta", "team2_price_delta",
+)
+
+SCHEMA_VERSION = 1
+
+COMPARISON_OPERATORS = (">=", "<=", "=", ">", "<")
+
+
+def _delta(current: Optional[float], previous: Optional[float]) -> Optional[float]:
+    if current is None or previous is None:
+        return None
+    return round(current - previous, 4)
+
+
+def build_feature_rows(match: Match, sentiment_analyzer: SentimentAnalyzer) -> List[Dict[str, Any]]:
+    """
+    Computes one feature row per interval of a match.
+
+    Odds deltas are taken against the most recent earlier interval that had a
+    price for the team, so intervals without an odds update do not break the
+    chain. A negative delta means the price shortened.
+
+    Args:
+        match: The match to materialize.
+        sentiment_analyzer: Used to score the comments.
+
+    Returns:
+        A list of dictionaries keyed by FEATURE_COLUMNS.
+    """
+    team1 = match.team1_info["name"]
+    team2 = match.team2_info["name"]
+    last_prices: Tuple[Optional[float], Optional[float]] = (None, None)
+    rows = []
+
+    for i, chunk in enumerate(match.chunks):
+        ball_metrics = compute_ball_metrics(chunk.balls)
+
+        scores, upvotes = [], []
+        for comment in chunk.comments:
+            if is_scorable(comment.text):
+                scores.append(sentiment_analyzer.get_sentiment_score(comment.text))
+                upvotes.append(comment.upvotes)
+        sentiment = compute_sentiment_stats(scores, upvotes)
+
+        prices = odds_for_teams(chunk.odds, (team1, team2))
+        deltas = tuple(_delta(p, last) for p, last in zip(prices, last_prices))
+        last_prices = tuple(p if p is not None else last for p, last in zip(prices, last_prices))
+
+        batting_price = batting_delta = None
+        if chunk.balls:
+            batting = team_key(ball_metrics["batting_team"])
+            if batting == team_key(team1):
+                batting_price, batting_delta = prices[0], deltas[0]
+            elif batting == team_key(team2):
+                batting_price, batting_delta = prices[1], deltas[1]
+
+        rows.append({
+            "match_id": match.match_id,
+            "chunk_index": i,
+            "chunk_name": chunk.name,
+            "start_time": chunk.start_time,
+            "end_time": chunk.end_time,
+            "is_pregame": int(chunk.is_pregame),
+            "is_innings_break": int(chunk.is_innings_break),
+            "team1": team1,
+            "team2": team2,
+            "batting_team": ball_metrics["batting_team"] if chunk.balls else None,
+            "last_over": ball_metrics["last_over"],
+            "runs": ball_metrics["runs"],
+            "valid_balls": ball_metrics["valid_balls"],
+            "wickets": ball_metrics["wickets"],
+            "fours": ball_metrics["fours"],
+            "sixes": ball_metrics["sixes"],
+            "wides": ball_metrics["wides"],
+            "dots": ball_metrics["dots"],
+            "run_rate": ball_metrics["run_rate"],
+            "dot_pct": ball_metrics["dot_pct"],
+            "boundary_pct": ball_metrics["boundary_pct"],
+            "partnership_runs": ball_metrics["partnership_runs"],
+            "comment_count": sentiment["count"],
+            "sentiment_avg": sentiment["average"],
+            "sentiment_weighted": sentiment["weighted_average"],
+            "sentiment_positive": sentiment["positive"],
+            "sentiment_negative": sentiment["negative"],
+            "sentiment_neutral": sentiment["neutral"],
+            "team1_price": prices[0],
+            "team2_price": prices[1],
+            "team1_price_delta": deltas[0],
+            "team2_price_delta": deltas[1],
+            "batting_price": batting_price,
+            "batting_price_delta": batting_delta,
+        })
+
+    return rows
+
+
+class FeatureStore:
+    """
+    A local SQLite table of per-interval features with secondary indexes on
+    the columns research queries filter and sort on.
+    """
+
+    def __init__(self, db_path: str):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self):
+        columns = ", ".join(f"{name} {kind}" for name, kind in FEATURE_COLUMNS.items())
+        with self.conn:
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS features ({columns}, PRIMARY KEY (match_id, chunk_index))"
+            )
+            for column in INDEXED_COLUMNS:
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_features_{column} ON features ({column})")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write_match(self, rows: List[Dict[str, Any]]) -> None:
+        """Replaces all stored rows for the match(es) in rows."""
+        if not rows:
+            return
+        names = list(FEATURE_COLUMNS)
+        placeholders = ", ".join("?" for _ in names)
+        with self.conn:
+            for match_id in {row["match_id"] for row in rows}:
+                self.conn.execute("DELETE FROM features WHERE match_id = ?", (match_id,))
+            self.conn.executemany(
+                f"INSERT INTO features ({', '.join(names)}) VALUES ({placeholders})",
+                [tuple(row[name] for name in names) for row in rows],
+            )
+
+    def match_ids(self) -> List[str]:
+        """Returns the ids of all materialized matches."""
+        return [r[0] for r in self.conn.execute("SELECT DISTINCT match_id FROM features")]
+
+    def query(self, ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+              conditions: Optional[List[Tuple[str, str, Any]]] = None, order_by: Optional[str] = None,
+              descending: bool = False, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Looks up intervals matching all the given filters.
+
+        Args:
+            ranges: Column -> (low, high) inclusive bounds; either bound may be None.
+            conditions: (column, operator, value) comparisons, where operator is
+                one of =, <, <=, >, >=.
+            order_by: Column to sort by (defaults to match and interval order).
+            descending: Sort order_by descending.
+            limit: Maximum number of rows to return.
+
+        Returns:
+            The matching rows as dictionaries.
+
+        Raises:
+            ValueError: If a column is not a feature column or an operator is unknown.
+        """
+        clauses, params = [], []
+        for column, (low, high) in (ranges or {}).items():
+            self._check_column(column)
+            if low is not None:
+                clauses.append(f"{column} >= ?")
+                params.append(low)
+            if high is not None:
+                clauses.append(f"{column} <= ?")
+                params.append(high)
+        for column, op, value in conditions or []:
+            self._check_column(column)
+            if op not in COMPARISON_OPERATORS:
+                raise ValueError(f"Unknown operator: {op}")
+            clauses.append(f"{column} {op} ?")
+            params.append(value)
+
+        sql = "SELECT * FROM features"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if order_by:
+            self._check_column(order_by)
+            sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}, match_id, chunk_index"
+        else:
+            sql += " ORDER BY CAST(match_id AS INTEGER), match_id, chunk_index"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    @staticmethod
+    def _check_column(column: str):
+        if column not in FEATURE_COLUMNS:
+            raise ValueError(f"Unknown feature column: {column}")
+
+
+def materialize(paths: Iterable[str], store: FeatureStore, skip_existing: bool = False) -> int:
+    """
+    Loads each chunk file, computes its feature rows and writes them to the store.
+
+    Args:
+        paths: Chunk JSON files to materialize.
+        store: The destination store.
+        skip_existing: Skip matches that are already in the store.
+
+    Returns:
+        The number of rows written.
+    """
+    sentiment_analyzer = SentimentAnalyzer()
+    existing = set(store.match_ids()) if skip_existing else set()
+    written = 0
+    for path in paths:
+        if Path(path).stem in existing:
+            print(f"Skipping {path} (already materialized)")
+            continue
+        print(f"Materializing {path}...")
+        try:
+            match = load_match(path)
+        except Exception as e:
+            print(f"Error reading or parsing JSON file {path}: {e}")
+            continue
+        rows = build_feature_rows(match, sentiment_analyzer)
+        store.write_match(rows)
+        written += len(rows)
+    return written
+
+
+def _parse_condition(text: str) -> Tuple[str, str, float]:
+    """Parses a filter such as 'dot_pct>=50' into (column, operator, value)."""
+    for op in COMPARISON_OPERATORS:
+        if op in text:
+            column, value = text.split(op, 1)
+            return column.strip(), op, float(value)
+    raise ValueError(f"Could not parse filter '{text}'. Use e.g. dot_pct>=50")
+
+
+def _expand_inputs(inputs: List[str]) -> List[str]:
+    paths = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            paths.extend(str(p) for p in sorted(path.glob("*.json"), key=lambda p: (len(p.stem), p.stem)))
+        else:
+            paths.append(str(path))
+    return paths
+
+
+def main():
+    """Command-line entry point for building and querying the feature table."""
+    parser = argparse.ArgumentParser(description="Materialize and query per-interval IPL features.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Compute features for chunk files.")
+    build.add_argument("inputs", nargs="+", help="Chunk JSON files or directories (e.g. data/chunks).")
+    build.add_argument("--db", default="features.db", help="Path to the SQLite feature store.")
+    build.add_argument("--skip-existing", action="store_true", help="Skip matches already in the store.")
+
+    query = subparsers.add_parser("query", help="Query the feature store.")
+    query.add_argument("filters", nargs="*", help="Filters such as dot_pct>=50 sentiment_avg<=-0.2.")
+    query.add_argument("--db", default="features.db", help="Path to the SQLite feature store.")
+    query.add_argument("--order-by", help="Column to sort by.")
+    query.add_argument("--desc", action="store_true", help="Sort descending.")
+    query.add_argument("--limit", type=int, default=20, help="Maximum rows to print.")
+    query.add_argument("--columns", default="match_id,chunk_name,batting_team,dot_pct,sentiment_avg,batting_price_delta",
+                       help="Comma-separated columns to print.")
+    args = parser.parse_args()
+
+    with FeatureStore(args.db) as store:
+        if args.command == "build":
+            written = materialize(_expand_inputs(args.inputs), store, skip_existing=args.skip_existing)
+            print(f"Wrote {written} rows to {args.db}")
+            return
+
+        try:
+            conditions = [_parse_condition(text) for text in args.filters]
+            rows = store.query(
+                conditions=conditions, order_by=args.order_by,
+                descending=args.desc, limit=args.limit,
+            )
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+        columns = [c.strip() for c in args.columns.split(",") if c.strip()]
+        print("\t".join(columns))
+        for row in rows:
+            print("\t".join("" if row.get(c) is None else str(row.get(c)) for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ipl_sentiment_betting.core.records import Ball, OddsSnapshot
+
+# VADER compound score thresholds for the positive/negative buckets.
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+
+
+def is_scorable(text: Optional[str]) -> bool:
+    """Returns True if a comment has text worth scoring (not empty or deleted)."""
+    return bool(text) and text != "[deleted]"
+
+
+def compute_ball_metrics(balls: List[Ball]) -> Dict[str, Any]:
+    """
+    Calculates the numeric on-field metrics for a list of balls.
+
+    Args:
+        balls: The balls bowled in an interval, in order.
+
+    Returns:
+        A dictionary of counts (runs, valid balls, wickets, fours, sixes, wides,
+        dots), rates (run rate, dot %, boundary %), the partnership runs since
+        the last wicket in the interval, the batting team and the last over.
+    """
+    total_runs, wickets, fours, sixes, wides, dots, valid_balls = (0, 0, 0, 0, 0, 0, 0)
+    partnership_runs = 0
+    batting_team = "Unknown"
+    last_ball = None
+
+    for ball in balls:
+        total_runs += ball.runs
+        partnership_runs += ball.runs
+        batting_team = ball.team
+        if ball.ball is not None:
+            last_ball = ball.ball
+
+        if ball.is_valid: valid_balls += 1
+        if "wide" in ball.score_name.lower(): wides += 1
+
+        if ball.is_wicket:
+            wickets += 1
+            partnership_runs = 0
+        elif ball.six:
+            sixes += 1
+        elif ball.four:
+            fours += 1
+        elif ball.is_valid and ball.runs == 0:
+            dots += 1
+
+    return {
+        "batting_team": batting_team,
+        "runs": total_runs,
+        "valid_balls": valid_balls,
+        "wickets": wickets,
+        "fours": fours,
+        "sixes": sixes,
+        "wides": wides,
+        "dots": dots,
+        "run_rate": (total_runs / (valid_balls / 6)) if valid_balls > 0 else 0,
+        "dot_pct": (dots / valid_balls * 100) if valid_balls > 0 else 0,
+        "boundary_pct": ((fours + sixes) / valid_balls * 100) if valid_balls > 0 else 0,
+        "partnership_runs": partnership_runs,
+        "last_over": int(last_ball) if last_ball is not None else None,
+    }
+
+
+def compute_sentiment_stats(scores: Sequence[float], upvotes: Optional[Sequence[int]] = None) -> Dict[str, Any]:
+    """
+    Aggregates a list of VADER compound scores.
+
+    Args:
+        scores: The compound score of each comment.
+        upvotes: Optional upvote counts aligned with scores, used for the
+            upvote-weighted average (each comment weighs 1 + its upvotes).
+
+    Returns:
+        A dictionary with the comment count, plain and weighted averages and the
+        positive/negative/neutral distribution.
+    """
+    count = len(scores)
+    if count == 0:
+        return {"count": 0, "average": 0.0, "weighted_average": 0.0,
+                "positive": 0, "negative": 0, "neutral": 0}
+
+    positive = sum(1 for s in scores if s > POSITIVE_THRESHOLD)
+    negative = sum(1 for s in scores if s < NEGATIVE_THRESHOLD)
+
+    if upvotes is None:
+        weighted_average = sum(scores) / count
+    else:
+        weights = [1 + max(u, 0) for u in upvotes]
+        weighted_average = sum(s * w for s, w in zip(scores, weights)) / sum(weights)
+
+    return {
+        "count": count,
+        "average": sum(scores) / count,
+        "weighted_average": weighted_average,
+        "positive": positive,
+        "negative": negative,
+        "neutral": count - positive - negative,
+    }
+
+
+def team_key(name: str) -> str:
+    """
+    Returns a key that matches a team across data sources.
+
+    The odds feed and Sportmonks disagree on some names (e.g. "Royal Challengers
+    Bangalore" vs "Royal Challengers Bengaluru"), but every IPL franchise has a
+    distinct first word.
+    """
+    return name.split(" ", 1)[0].lower() if name else ""
+
+
+def odds_for_teams(odds: List[OddsSnapshot], team_names: Sequence[str]) -> Tuple[Optional[float], ...]:
+    """
+    Picks each team's latest price out of an interval's odds snapshots.
+
+    Args:
+        odds: The interval's odds snapshots, latest first.
+        team_names: The teams to look up.
+
+    Returns:
+        One price per team, None where the team is not quoted.
+    """
+    if not odds:
+        return tuple(None for _ in team_names)
+    prices = {team_key(name): price for name, price in odds[0].prices}
+    return tuple(prices.get(team_key(name)) for name in team_names)
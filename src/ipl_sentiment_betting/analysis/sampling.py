@@ -0,0 +1,108 @@
+import heapq
+import math
+import random
+from typing import Dict, List, Optional, Set, Tuple
+
+from ipl_sentiment_betting.analysis.metrics import NEGATIVE_THRESHOLD, POSITIVE_THRESHOLD
+
+BUCKETS = ("positive", "negative", "neutral")
+
+# How many comments to quote from each sentiment bucket, and the prompt budget.
+SAMPLES_PER_BUCKET = {"positive": 3, "negative": 3, "neutral": 2}
+COMMENT_CHAR_LIMIT = 280
+TOTAL_CHAR_BUDGET = 1500
+MIN_COMMENT_CHARS = 3
+
+# Fixed seed so the same interval always yields the same sample.
+SAMPLE_SEED = 20240322
+
+
+def sentiment_bucket(score: float) -> str:
+    if score > POSITIVE_THRESHOLD:
+        return "positive"
+    if score < NEGATIVE_THRESHOLD:
+        return "negative"
+    return "neutral"
+
+
+def truncate_comment(text: str, limit: int = COMMENT_CHAR_LIMIT) -> str:
+    """Shortens text to at most limit characters, cutting at a word boundary."""
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    cut = text[:limit - 1].rsplit(" ", 1)[0] or text[:limit - 1]
+    return cut + "…"
+
+
+class RepresentativeSampler:
+    """
+    Picks representative comments from a stream in one pass.
+
+    Comments are bucketed by sentiment and each bucket keeps a weighted
+    reservoir sample (Efraimidis-Spirakis), where a comment's weight is
+    1 + its upvotes. Memory is bounded by the sample sizes, not the number
+    of comments: a repeated comment is only checked against the comments
+    currently held, so it is never quoted twice, but each repeat is another
+    draw, as a chant the crowd keeps posting should be. Unlike taking the
+    extreme scores, the sample reflects what the crowd actually upvoted in
+    each bucket, including the neutral one.
+
+    Args:
+        per_bucket: Sample size for each of positive, negative and neutral.
+        comment_char_limit: Longer comments are truncated to this length.
+        total_char_budget: Maximum characters across the whole sample.
+        rng: Random source (default: seeded with SAMPLE_SEED).
+    """
+
+    def __init__(self, per_bucket: Optional[Dict[str, int]] = None, comment_char_limit: int = COMMENT_CHAR_LIMIT,
+                 total_char_budget: int = TOTAL_CHAR_BUDGET, rng: Optional[random.Random] = None):
+        self.per_bucket = per_bucket or SAMPLES_PER_BUCKET
+        self.comment_char_limit = comment_char_limit
+        self.total_char_budget = total_char_budget
+        self.rng = rng or random.Random(SAMPLE_SEED)
+        self._reservoirs: Dict[str, List[Tuple[float, int, str]]] = {b: [] for b in BUCKETS}
+        self._held: Set[str] = set()
+        self._seq = 0
+
+    def add(self, text: str, score: float, upvotes: int = 0):
+        """Offers one scored comment to the sample."""
+        text = text.strip()
+        if len(text) < MIN_COMMENT_CHARS or text in self._held:
+            return
+
+        bucket = sentiment_bucket(score)
+        size = self.per_bucket.get(bucket, 0)
+        if size <= 0:
+            return
+        # Keeping the largest log(u) / w is keeping the largest u ** (1 / w).
+        key = math.log(1.0 - self.rng.random()) / (1 + max(upvotes, 0))
+        self._seq += 1
+        entry = (key, self._seq, text)
+        reservoir = self._reservoirs[bucket]
+        if len(reservoir) < size:
+            heapq.heappush(reservoir, entry)
+        elif entry > reservoir[0]:
+            self._held.discard(heapq.heapreplace(reservoir, entry)[2])
+        else:
+            return
+        self._held.add(text)
+
+    def sample(self) -> Dict[str, List[str]]:
+        """
+        Returns the chosen comments per bucket, within the character budgets.
+
+        Buckets are filled round-robin, strongest reservoir keys first, so a
+        tight total budget still leaves every bucket represented.
+        """
+        ranked = {b: [text for _, _, text in sorted(self._reservoirs[b], reverse=True)] for b in BUCKETS}
+        chosen: Dict[str, List[str]] = {b: [] for b in BUCKETS}
+        remaining = self.total_char_budget
+        for rank in range(max((len(r) for r in ranked.values()), default=0)):
+            for bucket in BUCKETS:
+                if rank >= len(ranked[bucket]):
+                    continue
+                text = truncate_comment(ranked[bucket][rank], self.comment_char_limit)
+                if len(text) <= remaining:
+                    chosen[bucket].append(text)
+                    remaining -= len(text)
+        return chosen
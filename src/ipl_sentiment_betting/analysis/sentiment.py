@@ -1,6 +1,12 @@
+from functools import lru_cache
+
 import nltk
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 
+# Scores are memoized per comment text: a match's comments are scored by the
+# per-interval summary and again by the sentiment timeline.
+SCORE_CACHE_SIZE = 65536
+
 class SentimentAnalyzer:
     """
     A class to handle sentiment analysis using NLTK's VADER.
@@ -23,8 +29,12 @@ class SentimentAnalyzer:
                 nltk.download('vader_lexicon')
             
             self.sid = SentimentIntensityAnalyzer()
+            self._compound = lru_cache(maxsize=SCORE_CACHE_SIZE)(self._score)
             self._initialized = True
 
+    def _score(self, comment: str) -> float:
+        return self.sid.polarity_scores(comment)["compound"]
+
     def get_sentiment_score(self, comment: str) -> float:
         """
         Calculates the compound sentiment score for a given comment using VADER.
@@ -39,4 +49,4 @@ class SentimentAnalyzer:
         if not isinstance(comment, str):
             return 0.0
 
-        return self.sid.polarity_scores(comment)["compound"]
+        return self._compound(comment)
@@ -0,0 +1,164 @@
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ipl_sentiment_betting.analysis.metrics import NEGATIVE_THRESHOLD, POSITIVE_THRESHOLD, is_scorable
+from ipl_sentiment_betting.core.records import Ball, Comment, Match
+
+# Default windows (seconds) either side of an event for reaction numbers.
+REACTION_BEFORE = 120
+REACTION_AFTER = 120
+
+
+class SentimentTimeline:
+    """
+    Scored comments of a match in time order, with prefix sums so that the
+    sentiment of any time window is answered in O(log n) without rescanning
+    the comments.
+
+    Windows are half-open, [start, end), in epoch seconds. Window statistics
+    use the same keys and weighting (1 + upvotes) as compute_sentiment_stats.
+    """
+
+    __slots__ = ("timestamps", "scores", "_sum", "_weight", "_weighted_sum", "_positive", "_negative")
+
+    def __init__(self, timestamps: Sequence[int], scores: Sequence[float], upvotes: Optional[Sequence[int]] = None):
+        if upvotes is None:
+            upvotes = [0] * len(scores)
+        order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+        self.timestamps = [timestamps[i] for i in order]
+        self.scores = [scores[i] for i in order]
+        weights = [1 + max(upvotes[i], 0) for i in order]
+
+        # Prefix sums with a leading zero: sum over [i, j) is p[j] - p[i].
+        self._sum = list(accumulate(self.scores, initial=0.0))
+        self._weight = list(accumulate(weights, initial=0))
+        self._weighted_sum = list(accumulate((s * w for s, w in zip(self.scores, weights)), initial=0.0))
+        self._positive = list(accumulate((s > POSITIVE_THRESHOLD for s in self.scores), initial=0))
+        self._negative = list(accumulate((s < NEGATIVE_THRESHOLD for s in self.scores), initial=0))
+
+    @classmethod
+    def from_comments(cls, comments: Sequence[Comment], score: Callable[[str], float]) -> "SentimentTimeline":
+        """
+        Scores comments once and indexes them by time.
+
+        Args:
+            comments: The comments to index; unscorable ones are skipped.
+            score: Returns a comment's compound score (e.g.
+                SentimentAnalyzer().get_sentiment_score).
+        """
+        scored = [c for c in comments if is_scorable(c.text)]
+        return cls(
+            [c.timestamp for c in scored],
+            [score(c.text) for c in scored],
+            [c.upvotes for c in scored],
+        )
+
+    @classmethod
+    def from_match(cls, match: Match, score: Callable[[str], float]) -> "SentimentTimeline":
+        """Indexes every comment of a match, across all its chunks."""
+        return cls.from_comments([c for chunk in match.chunks for c in chunk.comments], score)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def _bounds(self, start: int, end: int) -> Tuple[int, int]:
+        i = bisect_left(self.timestamps, start)
+        j = bisect_left(self.timestamps, end, lo=i)
+        return i, j
+
+    def count(self, start: int, end: int) -> int:
+        i, j = self._bounds(start, end)
+        return j - i
+
+    def average(self, start: int, end: int) -> Optional[float]:
+        """Mean score in [start, end), or None if the window has no comments."""
+        i, j = self._bounds(start, end)
+        return (self._sum[j] - self._sum[i]) / (j - i) if j > i else None
+
+    def window(self, start: int, end: int) -> Dict[str, Any]:
+        """
+        Sentiment statistics for the comments in [start, end).
+
+        Returns:
+            count, average, weighted_average, positive, negative and neutral,
+            as from compute_sentiment_stats.
+        """
+        i, j = self._bounds(start, end)
+        count = j - i
+        if count == 0:
+            return {"count": 0, "average": 0.0, "weighted_average": 0.0,
+                    "positive": 0, "negative": 0, "neutral": 0}
+        positive = self._positive[j] - self._positive[i]
+        negative = self._negative[j] - self._negative[i]
+        return {
+            "count": count,
+            "average": (self._sum[j] - self._sum[i]) / count,
+            "weighted_average": (self._weighted_sum[j] - self._weighted_sum[i]) / (self._weight[j] - self._weight[i]),
+            "positive": positive,
+            "negative": negative,
+            "neutral": count - positive - negative,
+        }
+
+    def rolling(self, width: int, step: Optional[int] = None, start: Optional[int] = None,
+                end: Optional[int] = None) -> List[Tuple[int, Optional[float]]]:
+        """
+        A rolling mean sentiment curve.
+
+        Args:
+            width: Window length in seconds.
+            step: Seconds between points (default: width, i.e. tumbling windows).
+            start: First window start (default: the first comment).
+            end: Last window end (default: just after the last comment).
+
+        Returns:
+            (window end, mean score or None) per window.
+        """
+        if not self.timestamps:
+            return []
+        step = step or width
+        start = self.timestamps[0] if start is None else start
+        end = self.timestamps[-1] + 1 if end is None else end
+        curve = []
+        window_end = start + width
+        while window_end - width < end:
+            curve.append((window_end, self.average(window_end - width, window_end)))
+            window_end += step
+        return curve
+
+    def reaction(self, at: int, before: int = REACTION_BEFORE, after: int = REACTION_AFTER,
+                 until: Optional[int] = None) -> Dict[str, Any]:
+        """
+        How sentiment moved around an event, e.g. a wicket.
+
+        Args:
+            at: The event time.
+            before: Seconds of baseline before the event.
+            after: Seconds of reaction after the event.
+            until: Optional cut-off for the reaction window (e.g. the end of
+                the interval being analysed), so no later comments leak in.
+
+        Returns:
+            before/after mean scores (None if a side has no comments), their
+            delta, and the comment count on each side.
+        """
+        after_end = at + after if until is None else min(at + after, until)
+        baseline = self.average(at - before, at)
+        response = self.average(at, after_end)
+        delta = response - baseline if baseline is not None and response is not None else None
+        return {
+            "before": baseline,
+            "after": response,
+            "delta": delta,
+            "before_count": self.count(at - before, at),
+            "after_count": self.count(at, after_end),
+        }
+
+    def ball_reactions(self, balls: Sequence[Ball], until: Optional[int] = None,
+                       before: int = REACTION_BEFORE, after: int = REACTION_AFTER) -> List[Tuple[Ball, Dict[str, Any]]]:
+        """Sentiment reaction to each wicket and six, aligned to the ball's timestamp."""
+        return [
+            (ball, self.reaction(ball.timestamp, before, after, until))
+            for ball in balls
+            if ball.timestamp and (ball.is_wicket or ball.six)
+        ]
@@ -1,10 +1,17 @@
 import json
-import time
 import pandas as pd
 import google.generativeai as genai
-from typing import List, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional
 from ipl_sentiment_betting.utils.config import Config
+from ipl_sentiment_betting.utils.profiling import NULL_PROFILER
+from ipl_sentiment_betting.analysis.metrics import compute_ball_metrics, compute_sentiment_stats, is_scorable
+from ipl_sentiment_betting.analysis.sampling import RepresentativeSampler
 from ipl_sentiment_betting.analysis.sentiment import SentimentAnalyzer
+from ipl_sentiment_betting.analysis.windows import SentimentTimeline
+from ipl_sentiment_betting.core.checkpoint import CheckpointLog, interval_input_hash, is_failed_update
+from ipl_sentiment_betting.core.batching import BATCH_RESPONSE_SCHEMA, ResponseTruncated, build_batch_prompt, parse_batch_response, plan_batches, section_tokens
+from ipl_sentiment_betting.core.records import Ball, Chunk, Comment, Match, OddsSnapshot, format_timestamp
+from ipl_sentiment_betting.core.scheduler import JobDropped, JobOptions, LLMScheduler, get_shared_scheduler, interval_priority
 
 class MatchAnalyzer:
     """
@@ -12,12 +19,17 @@ class MatchAnalyzer:
     Google AI API for all generative tasks.
     """
 
-    def __init__(self):
+    def __init__(self, scheduler: Optional[LLMScheduler] = None):
         """
         Initializes the analyzer, configuring the Google AI API client.
+
+        Args:
+            scheduler: Scheduler to submit model requests to. Defaults to the
+                process-wide one, so concurrent matches share one quota.
         """
         Config.validate()
         genai.configure(api_key=Config.GOOGLE_API_KEY)
+        self.scheduler = scheduler or get_shared_scheduler()
         
         # Initialize local sentiment analyzer
         self.sentiment_analyzer = SentimentAnalyzer()
@@ -41,29 +53,78 @@ class MatchAnalyzer:
         print("Google AI Model initialized successfully.")
 
 
-    def generate_api_response(self, user_prompt: str) -> str:
-        """Generates a response from the Google AI API."""
+    def _call_model(self, user_prompt: str) -> str:
+        response = self.generative_model.generate_content(user_prompt)
+        return response.text.strip()
+
+    def _call_model_json(self, user_prompt: str) -> str:
+        response = self.generative_model.generate_content(
+            user_prompt,
+            generation_config=genai.GenerationConfig(
+                response_mime_type="application/json",
+                response_schema=BATCH_RESPONSE_SCHEMA,
+                max_output_tokens=Config.LLM_BATCH_OUTPUT_TOKENS,
+            ),
+        )
+        if response.candidates and response.candidates[0].finish_reason == genai.protos.Candidate.FinishReason.MAX_TOKENS:
+            raise ResponseTruncated(f"the response reached the {Config.LLM_BATCH_OUTPUT_TOKENS}-token output limit")
+        return response.text
+
+    def generate_api_response(self, user_prompt: str, options: Optional[JobOptions] = None) -> str:
+        """Generates a response from the Google AI API, paced and prioritised by the scheduler."""
         try:
-            response = self.generative_model.generate_content(user_prompt)
-            return response.text.strip()
+            return self.scheduler.submit(self._call_model, user_prompt, options).result()
+        except JobDropped as e:
+            print(f"Skipped Google AI API call: {e}")
+            return f"Skipped: {e}."
         except Exception as e:
             print(f"Error calling Google AI API: {e}")
             return "Error: Could not generate a summary from the AI model."
 
-    def format_odds(self, odds_data: Optional[List[Dict[str, Any]]]) -> str:
+    def generate_batch_updates(self, user_prompt: str, interval_ids: List[str], options: Optional[JobOptions] = None) -> Dict[str, str]:
+        """
+        Requests updates for several intervals in one structured response.
+
+        The job is costed against the token budget with the full
+        Config.LLM_BATCH_OUTPUT_TOKENS response it may produce.
+
+        Returns:
+            The valid updates keyed by interval id; intervals that are missing
+            (or the whole batch, if the request fails) need a fallback request.
+
+        Raises:
+            ResponseTruncated: If the response was cut off at the output token
+                limit, so the caller can retry the batch in smaller parts.
+        """
+        options = options or JobOptions()
+        options = JobOptions(options.priority, options.key, options.deadline,
+                             max_output_tokens=Config.LLM_BATCH_OUTPUT_TOKENS)
+        try:
+            response_text = self.scheduler.submit(self._call_model_json, user_prompt, options).result()
+        except ResponseTruncated:
+            raise
+        except JobDropped as e:
+            print(f"Skipped batched Google AI API call: {e}")
+            return {}
+        except Exception as e:
+            print(f"Error calling Google AI API for batch: {e}")
+            return {}
+        return parse_batch_response(response_text, interval_ids)
+
+    def format_odds(self, odds_data: Optional[List[OddsSnapshot]]) -> str:
         """Formats odds data from the chunk structure."""
-        if not odds_data or not isinstance(odds_data, list) or not odds_data[0].get("odds"):
+        if not odds_data or not isinstance(odds_data, list) or not odds_data[0].prices:
             return "No odds data available for this interval."
         try:
-            latest_odds_entry = odds_data[0]["odds"]
-            odds_str = ", ".join([f"{o['name']}: {o['price']}" for o in latest_odds_entry])
-            update_time = odds_data[0].get("last_update", "unknown time")
+            latest_odds_entry = odds_data[0].prices
+            odds_str = ", ".join([f"{name}: {price}" for name, price in latest_odds_entry])
+            update_time = format_timestamp(odds_data[0].timestamp)
             return f"Latest odds ({update_time}): {odds_str}"
-        except (KeyError, IndexError, TypeError) as e:
+        except (ValueError, TypeError) as e:
             print(f"Warning: Could not parse odds data: {e} - Data: {odds_data}")
             return "Could not parse odds data."
 
-    def summarize_ball_by_ball(self, balls_data: List[Dict[str, Any]], team1_info: Dict[str, Any], team2_info: Dict[str, Any]) -> str:
+    def summarize_ball_by_ball(self, balls_data: List[Ball], team1_info: Dict[str, Any], team2_info: Dict[str, Any]) -> str:
         """
         Summarizes key events from the ball-by-ball data list ('balls' key),
         including player-team associations and advanced metrics.
@@ -76,26 +137,11 @@ class MatchAnalyzer:
         for player in team2_info.get("xi", []): player_to_team[player] = team2_info["name"]
 
         event_summary = []
-        total_runs, wickets, fours, sixes, wides, dots, valid_balls_count = (0, 0, 0, 0, 0, 0, 0)
-        batting_team_name = "Unknown"
-        
-        # Track partnership for this chunk (simplified)
-        current_partnership_runs = 0
-
         for ball_info in balls_data:
             try:
-                score_info = ball_info.get("score", {})
-                ball_num = ball_info.get("ball", "?")
-                runs = score_info.get("runs", 0)
-                is_wicket = score_info.get("is_wicket", False)
-                is_four = score_info.get("four", False)
-                is_six = score_info.get("six", False)
-                is_valid_ball = score_info.get("ball", False)
-                score_name = score_info.get("name", "").lower()
-                
-                batsman_name = ball_info.get("batsman", {}).get("fullname", "Unknown Batsman")
-                bowler_name = ball_info.get("bowler", {}).get("fullname", "Unknown Bowler")
-                batting_team_name = ball_info.get("name", batting_team_name)
+                ball_num = ball_info.ball if ball_info.ball is not None else "?"
+                batsman_name = ball_info.batsman
+                bowler_name = ball_info.bowler
 
                 batsman_team = player_to_team.get(batsman_name, "")
                 bowler_team = player_to_team.get(bowler_name, "")
@@ -103,40 +149,26 @@ class MatchAnalyzer:
                 batsman_str = f"{batsman_name} ({batsman_team})" if batsman_team else batsman_name
                 bowler_str = f"{bowler_name} ({bowler_team})" if bowler_team else bowler_name
 
-                total_runs += runs
-                current_partnership_runs += runs
-                
-                if is_valid_ball: valid_balls_count += 1
-                if "wide" in score_name: wides += 1
-                
                 event_desc = None
-                if is_wicket:
-                    wickets += 1
-                    current_partnership_runs = 0 # Reset partnership on wicket
+                if ball_info.is_wicket:
                     event_desc = f"WICKET at {ball_num}! {batsman_str} out b {bowler_str}."
-                elif is_six:
-                    sixes += 1
+                elif ball_info.six:
                     event_desc = f"SIX at {ball_num}! by {batsman_str} off {bowler_str}."
-                elif is_four:
-                    fours += 1
+                elif ball_info.four:
                     event_desc = f"FOUR at {ball_num}! by {batsman_str} off {bowler_str}."
-                elif is_valid_ball and runs == 0:
-                    dots += 1
                 
                 if event_desc: event_summary.append(event_desc)
             except Exception as e:
                 print(f"Warning: Error processing ball data: {e} - Data: {ball_info}")
                 continue
         
-        run_rate = (total_runs / (valid_balls_count / 6)) if valid_balls_count > 0 else 0
-        dot_percentage = (dots / valid_balls_count * 100) if valid_balls_count > 0 else 0
-        boundary_percentage = ((fours + sixes) / valid_balls_count * 100) if valid_balls_count > 0 else 0
+        metrics = compute_ball_metrics(balls_data)
         
         overall_summary = (
-            f"Summary for {batting_team_name}: {total_runs} runs from {valid_balls_count} balls "
-            f"(RR: {run_rate:.2f}). Wickets: {wickets}.\n"
-            f"Metrics: Dot Ball %: {dot_percentage:.1f}%, Boundary %: {boundary_percentage:.1f}%, "
-            f"Partnership Runs (this interval): {current_partnership_runs}."
+            f"Summary for {metrics['batting_team']}: {metrics['runs']} runs from {metrics['valid_balls']} balls "
+            f"(RR: {metrics['run_rate']:.2f}). Wickets: {metrics['wickets']}.\n"
+            f"Metrics: Dot Ball %: {metrics['dot_pct']:.1f}%, Boundary %: {metrics['boundary_pct']:.1f}%, "
+            f"Partnership Runs (this interval): {metrics['partnership_runs']}."
         )
         
         full_summary = overall_summary
@@ -145,7 +177,7 @@ class MatchAnalyzer:
         
         return full_summary
 
-    def analyze_sentiment(self, comments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def analyze_sentiment(self, comments: List[Comment]) -> Dict[str, Any]:
         """
         Analyzes sentiment of comments locally.
         Returns a summary dictionary with scores and representative comments.
@@ -154,27 +186,24 @@ class MatchAnalyzer:
             return {"summary": "No comments available.", "average_score": 0.0}
 
         scores = []
-        valid_comments = []
+        sampler = RepresentativeSampler()
         
         for c in comments:
-            text = c.get("comment")
-            if text and text != "[deleted]":
+            text = c.text
+            if is_scorable(text):
                 score = self.sentiment_analyzer.get_sentiment_score(text)
                 scores.append(score)
-                valid_comments.append({"text": text, "score": score})
+                sampler.add(text, score, c.upvotes)
         
         if not scores:
             return {"summary": "No valid comments for analysis.", "average_score": 0.0}
             
-        avg_score = sum(scores) / len(scores)
-        positive_count = sum(1 for s in scores if s > 0.05)
-        negative_count = sum(1 for s in scores if s < -0.05)
-        neutral_count = len(scores) - positive_count - negative_count
+        stats = compute_sentiment_stats(scores)
+        avg_score = stats["average"]
+        positive_count, negative_count, neutral_count = stats["positive"], stats["negative"], stats["neutral"]
         
-        # Select representative comments (highest/lowest scores)
-        valid_comments.sort(key=lambda x: x["score"])
-        top_positive = valid_comments[-3:] if valid_comments[-1]["score"] > 0.5 else []
-        top_negative = valid_comments[:3] if valid_comments[0]["score"] < -0.5 else []
+        # Select representative comments (upvote-weighted sample per sentiment bucket)
+        sample = sampler.sample()
         
         summary_str = (
             f"Sentiment Analysis (VADER): Average Score: {avg_score:.2f} (-1 to 1). "
@@ -184,13 +213,13 @@ class MatchAnalyzer:
         return {
             "summary": summary_str,
             "average_score": avg_score,
-            "top_positive": [c["text"] for c in top_positive],
-            "top_negative": [c["text"] for c in top_negative]
+            "top_positive": sample["positive"],
+            "top_negative": sample["negative"],
+            "top_neutral": sample["neutral"]
         }
 
-    def generate_match_update(self, ball_summary: str, odds_summary: str, sentiment_data: Dict[str, Any], team1_name: str, team2_name: str, match_history: List[str] = []) -> str:
-        """Generates a professional, data-driven summary of a match interval using the Google AI API."""
-        
+    def format_interval_data(self, ball_summary: str, odds_summary: str, sentiment_data: Dict[str, Any]) -> List[str]:
+        """Formats an interval's local analysis as the data sections of a model prompt."""
         data_points = []
         if "No balls recorded" not in ball_summary:
             data_points.append(f"### On-Field Action (with Metrics)\n{ball_summary}")
@@ -201,19 +230,40 @@ class MatchAnalyzer:
         data_points.append(f"### Fan Sentiment Analysis\n{sentiment_data['summary']}")
         
         if sentiment_data.get("top_positive"):
-            data_points.append(f"**Top Bullish Comments:**\n" + "\n".join([f"- {c}" for c in sentiment_data["top_positive"]]))
+            data_points.append(f"**Representative Bullish Comments:**\n" + "\n".join([f"- {c}" for c in sentiment_data["top_positive"]]))
         if sentiment_data.get("top_negative"):
-            data_points.append(f"**Top Bearish Comments:**\n" + "\n".join([f"- {c}" for c in sentiment_data["top_negative"]]))
-        
-        if not data_points:
-            return "No new data available in this interval to generate an update."
+            data_points.append(f"**Representative Bearish Comments:**\n" + "\n".join([f"- {c}" for c in sentiment_data["top_negative"]]))
+        if sentiment_data.get("top_neutral"):
+            data_points.append(f"**Representative Neutral Comments:**\n" + "\n".join([f"- {c}" for c in sentiment_data["top_neutral"]]))
+        if sentiment_data.get("trend"):
+            data_points.append(f"**Sentiment Trend:** {sentiment_data['trend']}")
+        if sentiment_data.get("reactions"):
+            data_points.append(f"**Sentiment Reactions to Key Events:**\n{sentiment_data['reactions']}")
+        return data_points
 
-        # Format history for context
+    def format_history(self, match_history: List[str]) -> str:
+        """Formats the most recent model updates as narrative context."""
         history_context = ""
         if match_history:
             history_context = "### Match Narrative History (Previous Intervals)\n"
             for i, update in enumerate(match_history[-3:]): # Keep last 3 updates for relevance
                 history_context += f"**Interval {i+1}:** {update}\n\n"
+        return history_context
+
+    @staticmethod
+    def narrative_history(rows: Iterable[Dict[str, Any]]) -> List[str]:
+        """The model updates of earlier result rows, leaving out failed or skipped calls."""
+        return [row["analysis_update"] for row in rows if not is_failed_update(row["analysis_update"])]
+
+    def generate_match_update(self, ball_summary: str, odds_summary: str, sentiment_data: Dict[str, Any], team1_name: str, team2_name: str, match_history: List[str] = [], options: Optional[JobOptions] = None) -> str:
+        """Generates a professional, data-driven summary of a match interval using the Google AI API."""
+        
+        data_points = self.format_interval_data(ball_summary, odds_summary, sentiment_data)
+        if not data_points:
+            return "No new data available in this interval to generate an update."
+
+        # Format history for context
+        history_context = self.format_history(match_history)
 
         user_prompt_content = "\n\n".join(data_points)
         user_prompt = f"""
@@ -233,39 +283,258 @@ class MatchAnalyzer:
         4. **Provide** a clear "Trader Sentiment" verdict.
         """
         
-        return self.generate_api_response(user_prompt)
+        return self.generate_api_response(user_prompt, options)
+
+    def build_timeline(self, match_data: Match) -> SentimentTimeline:
+        """Scores every comment of a match once, for sub-interval sentiment windows."""
+        return SentimentTimeline.from_match(match_data, self.sentiment_analyzer.get_sentiment_score)
+
+    def summarize_sentiment_windows(self, chunk: Chunk, timeline: SentimentTimeline, trend_seconds: int = 60) -> Dict[str, str]:
+        """
+        Describes how sentiment moved within an interval.
+
+        Args:
+            chunk: The interval.
+            timeline: The match's sentiment timeline.
+            trend_seconds: Width of each point of the trend.
 
-    def process_match_data(self, match_data: Dict[str, Any], team1_info: Dict[str, Any], team2_info: Dict[str, Any]) -> pd.DataFrame:
-        """Processes all data chunks for a match."""
+        Returns:
+            "trend": mean sentiment per window across the interval, and
+            "reactions": the before/after sentiment around each wicket and six.
+            Neither looks past the end of the interval.
+        """
+        if not chunk.start_time or not chunk.end_time:
+            return {"trend": "", "reactions": ""}
+
+        curve = timeline.rolling(trend_seconds, start=chunk.start_time, end=chunk.end_time)
+        trend = ""
+        if any(avg is not None for _, avg in curve):
+            points = ", ".join("n/a" if avg is None else f"{avg:+.2f}" for _, avg in curve)
+            trend = f"Per {trend_seconds}s: {points}"
+
+        reactions = []
+        for ball, reaction in timeline.ball_reactions(chunk.balls, until=chunk.end_time):
+            if reaction["delta"] is None:
+                continue
+            event = "WICKET" if ball.is_wicket else "SIX"
+            reactions.append(
+                f"- {event} at {ball.ball} ({ball.batsman}): {reaction['before']:+.2f} -> {reaction['after']:+.2f} "
+                f"(change {reaction['delta']:+.2f}; {reaction['before_count']} comments before, {reaction['after_count']} after)"
+            )
+        return {"trend": trend, "reactions": "\n".join(reactions)}
+
+    def summarize_chunk(self, chunk: Chunk, team1_info: Dict[str, Any], team2_info: Dict[str, Any], timeline: Optional[SentimentTimeline] = None) -> Dict[str, Any]:
+        """Runs the local (non-LLM) analysis of a single interval."""
+        sentiment_data = self.analyze_sentiment(chunk.comments)
+        if timeline is not None:
+            sentiment_data.update(self.summarize_sentiment_windows(chunk, timeline))
+        return {
+            "ball_by_ball_summary": self.summarize_ball_by_ball(chunk.balls, team1_info, team2_info),
+            "odds_summary": self.format_odds(chunk.odds),
+            "sentiment_data": sentiment_data,
+        }
+
+    def analyze_chunk(self, chunk: Chunk, team1_info: Dict[str, Any], team2_info: Dict[str, Any], match_history: List[str], chunk_id: Optional[str] = None, options: Optional[JobOptions] = None, timeline: Optional[SentimentTimeline] = None) -> Dict[str, Any]:
+        """
+        Analyzes a single interval, including the model update.
+
+        Args:
+            chunk: The interval to analyze.
+            team1_info: Name and playing XI of the first team.
+            team2_info: Name and playing XI of the second team.
+            match_history: Model updates from the previous intervals, oldest first.
+            chunk_id: Name to report the interval under (defaults to chunk.name).
+            options: Priority, coalescing key and deadline for the model request.
+            timeline: The match's sentiment timeline, for the trend and event
+                reactions within the interval.
+
+        Returns:
+            A result row with the interval's summaries and model update.
+        """
+        local = self.summarize_chunk(chunk, team1_info, team2_info, timeline)
+        update_text = self.generate_match_update(
+            local["ball_by_ball_summary"], local["odds_summary"], local["sentiment_data"],
+            team1_info['name'], team2_info['name'], match_history=match_history, options=options
+        )
+        return self.build_result_row(chunk_id or chunk.name, local, update_text)
+
+    def build_result_row(self, chunk_id: str, local: Dict[str, Any], update_text: str) -> Dict[str, Any]:
+        """Combines an interval's local analysis and model update into a result row."""
+        return {
+            "chunk_id": chunk_id,
+            "ball_by_ball_summary": local["ball_by_ball_summary"],
+            "odds_summary": local["odds_summary"],
+            "sentiment_summary": local["sentiment_data"]['summary'],
+            "sentiment_reactions": local["sentiment_data"].get("reactions", ""),
+            "analysis_update": update_text,
+        }
+
+    def interval_hash(self, local: Dict[str, Any], team1_name: str, team2_name: str) -> str:
+        """Hashes the prompt inputs of an interval, for checkpoint lookups."""
+        return interval_input_hash(team1_name, team2_name, self.format_interval_data(
+            local["ball_by_ball_summary"], local["odds_summary"], local["sentiment_data"]
+        ))
+
+    def process_match_data(self, match_data: Match, team1_info: Dict[str, Any], team2_info: Dict[str, Any], checkpoint: Optional[CheckpointLog] = None, profiler=NULL_PROFILER) -> pd.DataFrame:
+        """
+        Processes all data chunks for a match.
+
+        Args:
+            match_data: The match to analyse.
+            team1_info: Name and playing XI of the first team.
+            team2_info: Name and playing XI of the second team.
+            checkpoint: Optional log that each finished interval is recorded
+                in. Intervals already recorded with the same inputs are
+                restored from it instead of being sent to the model again.
+            profiler: Optional profiler (utils/profiling.py); the stages are
+                sentiment_timeline, summarize, model and dataframe, with one
+                memory interval per chunk.
+
+        Returns:
+            One result row per interval.
+        """
         all_match_updates = []
+        with profiler.stage("sentiment_timeline"):
+            timeline = self.build_timeline(match_data)
 
-        chunks = match_data.get('chunks', {})
+        chunks = match_data.chunks
         for i, chunk in enumerate(chunks):
-            chunk_id = chunk.get("name", f"chunk_{i+1}")
+            chunk_id = chunk.name or f"chunk_{i+1}"
             print(f"\n--- Processing Chunk {i+1}/{len(chunks)} ({chunk_id}) ---")
 
-            # Prepare data for the API
-            comments_in_chunk = chunk.get("comments", [])
-            odds_summary = self.format_odds(chunk.get("odds"))
-            ball_summary = self.summarize_ball_by_ball(chunk.get("balls"), team1_info, team2_info)
-            sentiment_data = self.analyze_sentiment(comments_in_chunk)
-            
-            # Match Update Generation
-            update_text = self.generate_match_update(
-                ball_summary, odds_summary, sentiment_data, team1_info['name'], team2_info['name'],
-                match_history=[u["analysis_update"] for u in all_match_updates]
-            )
-            print(f"  - Model Update: {update_text.replace(chr(10), ' ')[0:100]}...")
-
-            all_match_updates.append({
-                "chunk_id": chunk_id,
-                "ball_by_ball_summary": ball_summary,
-                "odds_summary": odds_summary,
-                "sentiment_summary": sentiment_data['summary'],
-                "analysis_update": update_text,
-            })
-            
-            # Add a delay to respect API rate limits
-            time.sleep(1)
+            with profiler.interval(chunk_id):
+                with profiler.stage("summarize"):
+                    local = self.summarize_chunk(chunk, team1_info, team2_info, timeline)
+                    input_hash = self.interval_hash(local, team1_info['name'], team2_info['name'])
+                if checkpoint is not None:
+                    restored = checkpoint.get(match_data.match_id, chunk_id, input_hash)
+                    if restored is not None:
+                        print("  - Restored from checkpoint.")
+                        all_match_updates.append(restored)
+                        continue
+
+                # No coalescing key: unlike a live interval, every historical
+                # interval needs its own update, however late it is sent.
+                priority = interval_priority(chunk, chunks[i-1] if i > 0 else None)
+                with profiler.stage("model"):
+                    update_text = self.generate_match_update(
+                        local["ball_by_ball_summary"], local["odds_summary"], local["sentiment_data"],
+                        team1_info['name'], team2_info['name'],
+                        match_history=self.narrative_history(all_match_updates),
+                        options=JobOptions(priority=priority),
+                    )
+                result = self.build_result_row(chunk_id, local, update_text)
+                print(f"  - Model Update: {result['analysis_update'].replace(chr(10), ' ')[0:100]}...")
+
+                if checkpoint is not None:
+                    checkpoint.record(match_data.match_id, input_hash, result)
+                all_match_updates.append(result)
+
+        with profiler.stage("dataframe"):
+            return pd.DataFrame(all_match_updates)
+
+    def process_match_backfill(self, match_data: Match, team1_info: Dict[str, Any], team2_info: Dict[str, Any], max_batch: Optional[int] = None, checkpoint: Optional[CheckpointLog] = None, profiler=NULL_PROFILER) -> pd.DataFrame:
+        """
+        Processes a historical match with several consecutive intervals per
+        model request.
+
+        Intervals are packed into batches sized to the request budgets in
+        Config (see batching.plan_batches). A batch whose response is cut off
+        at the output token limit is split in half and retried. Any interval
+        the batched response does not cover with a valid update is
+        re-requested on its own.
+
+        Args:
+            match_data: The match to analyse.
+            team1_info: Name and playing XI of the first team.
+            team2_info: Name and playing XI of the second team.
+            max_batch: Optional cap on intervals per request.
+            checkpoint: Optional checkpoint log, as for process_match_data.
+                Only intervals missing from it are batched.
+            profiler: Optional profiler, as for process_match_data; memory
+                intervals are per chunk while summarizing and per batch after.
+
+        Returns:
+            The same per-interval rows as process_match_data.
+        """
+        chunks = match_data.chunks
+        with profiler.stage("sentiment_timeline"):
+            timeline = self.build_timeline(match_data)
+        chunk_ids = [chunk.name or f"chunk_{i+1}" for i, chunk in enumerate(chunks)]
+        local_results = []
+        for chunk_id, chunk in zip(chunk_ids, chunks):
+            with profiler.interval(chunk_id), profiler.stage("summarize"):
+                local_results.append(self.summarize_chunk(chunk, team1_info, team2_info, timeline))
+        with profiler.stage("summarize"):
+            input_hashes = [self.interval_hash(local, team1_info['name'], team2_info['name']) for local in local_results]
+            sections = [
+                "\n\n".join(self.format_interval_data(
+                    local["ball_by_ball_summary"], local["odds_summary"], local["sentiment_data"]
+                ))
+                for local in local_results
+            ]
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(chunks)
+        if checkpoint is not None:
+            for i in range(len(chunks)):
+                results[i] = checkpoint.get(match_data.match_id, chunk_ids[i], input_hashes[i])
+        pending = [i for i, result in enumerate(results) if result is None]
+        if len(pending) < len(chunks):
+            print(f"Restored {len(chunks) - len(pending)} intervals from checkpoint.")
+
+        token_counts = [section_tokens(sections[i]) for i in pending]
+        batches = [[pending[j] for j in batch] for batch in plan_batches(token_counts, max_intervals=max_batch)]
+        print(f"Backfilling {len(pending)} intervals in {len(batches)} requests.")
+
+        def history_before(index: int) -> List[str]:
+            return self.narrative_history(r for r in results[:index] if r is not None)
+
+        batches.reverse()  # Used as a stack, so split halves run next and in order.
+        requests = 0
+        while batches:
+            batch = batches.pop()
+            requests += 1
+            ids = [chunk_ids[i] for i in batch]
+            print(f"\n--- Processing Batch {requests} ({ids[0]} to {ids[-1]}, {len(batches)} more queued) ---")
+
+            with profiler.interval(f"batch_{requests}"):
+                priorities = {i: interval_priority(chunks[i], chunks[i-1] if i > 0 else None) for i in batch}
+                user_prompt = build_batch_prompt(
+                    team1_info['name'], team2_info['name'],
+                    self.format_history(history_before(batch[0])),
+                    [(chunk_ids[i], sections[i]) for i in batch],
+                )
+                with profiler.stage("model"):
+                    try:
+                        updates = self.generate_batch_updates(
+                            user_prompt, ids, JobOptions(priority=max(priorities.values()))
+                        )
+                    except ResponseTruncated as e:
+                        if len(batch) > 1:
+                            print(f"  - Batched response truncated ({e}); splitting the batch in two.")
+                            half = len(batch) // 2
+                            batches.extend([batch[half:], batch[:half]])
+                            continue
+                        print(f"  - Batched response truncated ({e}).")
+                        updates = {}
+
+                for i in batch:
+                    local = local_results[i]
+                    update_text = updates.get(chunk_ids[i])
+                    if update_text is None:
+                        print(f"  - No valid batched update for {chunk_ids[i]}; requesting it on its own.")
+                        with profiler.stage("model"):
+                            update_text = self.generate_match_update(
+                                local["ball_by_ball_summary"], local["odds_summary"], local["sentiment_data"],
+                                team1_info['name'], team2_info['name'],
+                                match_history=history_before(i),
+                                options=JobOptions(priority=priorities[i]),
+                            )
+                    print(f"  - Model Update ({chunk_ids[i]}): {update_text.replace(chr(10), ' ')[0:100]}...")
+
+                    results[i] = self.build_result_row(chunk_ids[i], local, update_text)
+                    if checkpoint is not None:
+                        checkpoint.record(match_data.match_id, input_hashes[i], results[i])
 
-        return pd.DataFrame(all_match_updates)
+        with profiler.stage("dataframe"):
+            return pd.DataFrame(results)
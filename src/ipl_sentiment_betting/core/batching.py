@@ -0,0 +1,149 @@
+"""
+Packs consecutive match intervals into one structured model request.
+
+Backfills do not need an answer per interval as soon as it closes, so several
+intervals share one request (and one copy of the system prompt and history).
+The model answers with a JSON list of per-interval updates, validated against
+codec.BatchResponse.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ipl_sentiment_betting.core.scheduler import CHARS_PER_TOKEN
+from ipl_sentiment_betting.utils import codec
+from ipl_sentiment_betting.utils.config import Config
+
+# Gemini response schema matching codec.BatchResponse.
+BATCH_RESPONSE_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "interval_id": {"type": "string"},
+            "update": {"type": "string"},
+        },
+        "required": ["interval_id", "update"],
+    },
+}
+
+# Prompt text around the interval sections (instructions, teams, history).
+BATCH_OVERHEAD_TOKENS = 1000
+# Response tokens allowed per interval. Updates average about 2,700
+# characters (~680 tokens) in examples/74.md and reach 3,200 (~800), plus
+# the JSON quoting and escaping around each one.
+BATCH_UPDATE_TOKENS = 1000
+# gemini-2.5-flash counts its thinking tokens against max_output_tokens, so
+# part of the response budget is kept back for them.
+BATCH_THINKING_TOKENS = 2048
+
+
+class ResponseTruncated(Exception):
+    """Raised when a batched response was cut off at the output token limit."""
+
+
+def section_tokens(section: str) -> int:
+    return len(section) // CHARS_PER_TOKEN
+
+
+def plan_batches(token_counts: Sequence[int], max_input_tokens: Optional[int] = None,
+                 max_output_tokens: Optional[int] = None, max_intervals: Optional[int] = None) -> List[List[int]]:
+    """
+    Groups consecutive intervals into batches that fit one request.
+
+    A batch is closed when adding the next interval would exceed the input
+    budget, the output budget (BATCH_UPDATE_TOKENS per interval, after
+    BATCH_THINKING_TOKENS) or max_intervals. An interval too large for any
+    batch gets one to itself.
+
+    Args:
+        token_counts: Estimated prompt tokens for each interval, in order.
+        max_input_tokens: Prompt budget per request (default: Config.LLM_BATCH_INPUT_TOKENS).
+        max_output_tokens: Response budget per request (default: Config.LLM_BATCH_OUTPUT_TOKENS).
+        max_intervals: Optional hard cap on intervals per request.
+
+    Returns:
+        Lists of interval indices, in order.
+    """
+    max_input_tokens = max_input_tokens or Config.LLM_BATCH_INPUT_TOKENS
+    max_output_tokens = max_output_tokens or Config.LLM_BATCH_OUTPUT_TOKENS
+    size_cap = max(1, (max_output_tokens - BATCH_THINKING_TOKENS) // BATCH_UPDATE_TOKENS)
+    if max_intervals:
+        size_cap = min(size_cap, max_intervals)
+
+    batches: List[List[int]] = []
+    current: List[int] = []
+    used = BATCH_OVERHEAD_TOKENS
+    for i, tokens in enumerate(token_counts):
+        if current and (used + tokens > max_input_tokens or len(current) >= size_cap):
+            batches.append(current)
+            current, used = [], BATCH_OVERHEAD_TOKENS
+        current.append(i)
+        used += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_batch_prompt(team1_name: str, team2_name: str, history_context: str,
+                       sections: Sequence[Tuple[str, str]]) -> str:
+    """
+    Builds the prompt for one batch of intervals.
+
+    Args:
+        team1_name: Name of the first team.
+        team2_name: Name of the second team.
+        history_context: Formatted narrative from the intervals before the batch.
+        sections: (interval_id, interval data) pairs in match order.
+    """
+    interval_blocks = "\n\n".join(
+        f"## Interval `{interval_id}`\n{data}" for interval_id, data in sections
+    )
+    ids = ", ".join(f"`{interval_id}`" for interval_id, _ in sections)
+    return f"""
+        **Match Backfill Report**
+        **Teams:** {team1_name} vs {team2_name}
+
+        {history_context}
+
+        ### Consecutive Interval Data
+        {interval_blocks}
+
+        **Your Task:**
+        Write one concise summary for a professional cricket trader for EACH interval above, in order: {ids}.
+        For each interval:
+        1. **Synthesize** the on-field metrics (Dot %, Boundaries) with the sentiment score.
+        2. **Identify** if the fan sentiment aligns with the odds movement.
+        3. **Compare** the interval to the *Match Narrative History* and to the earlier intervals in this report. Have the odds shifted? Has sentiment reversed?
+        4. **Provide** a clear "Trader Sentiment" verdict.
+        Only use the data given for that interval and the ones before it. Keep each update under 450 words.
+        Respond with a JSON list containing one object per interval, with its `interval_id` and its `update` text.
+        """
+
+
+def parse_batch_response(text: str, interval_ids: Sequence[str]) -> Dict[str, str]:
+    """
+    Validates a batched model response and splits it into per-interval updates.
+
+    Entries for unknown intervals, duplicate entries and empty updates are
+    ignored, so the caller can fall back to single-interval requests for
+    whatever is missing.
+
+    Args:
+        text: The raw JSON response.
+        interval_ids: The intervals that were requested.
+
+    Returns:
+        Update text keyed by interval id; empty if the response is unusable.
+    """
+    try:
+        entries = codec.decode(text, codec.BatchResponse)
+    except codec.DecodeError as e:
+        print(f"Warning: Could not parse batched model response: {e}")
+        return {}
+
+    wanted = set(interval_ids)
+    updates: Dict[str, str] = {}
+    for entry in entries:
+        update = entry.update.strip()
+        if entry.interval_id in wanted and entry.interval_id not in updates and update:
+            updates[entry.interval_id] = update
+    return updates
@@ -0,0 +1,111 @@
+"""
+A durable log of finished intervals, so an interrupted run can resume.
+
+Each finished interval is appended to a JSON Lines file as a
+codec.CheckpointEntry and fsynced before the run moves on. An entry is keyed
+by match id + chunk name + a hash of the interval's prompt inputs. If the
+data or the local analysis of an interval changes, its hash changes and the
+interval is analysed again.
+"""
+import hashlib
+import os
+import threading
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from ipl_sentiment_betting.utils import codec
+
+# Updates that mean the model was not reached; these are never checkpointed.
+FAILED_UPDATE_PREFIXES = ("Error:", "Skipped:")
+
+
+def interval_input_hash(team1_name: str, team2_name: str, data_points: Sequence[str]) -> str:
+    """Hashes what an interval's model update is generated from."""
+    digest = hashlib.sha256()
+    for part in (team1_name, team2_name, *data_points):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def is_failed_update(update_text: str) -> bool:
+    return update_text.startswith(FAILED_UPDATE_PREFIXES)
+
+
+class CheckpointLog:
+    """
+    Appends finished intervals to a JSON Lines file and looks them up on
+    restart.
+
+    A line torn by a crash mid-write is ignored when the log is read back, and
+    later entries for the same interval replace earlier ones.
+
+    Args:
+        path: The log file; created on the first record.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[Tuple[str, str], codec.CheckpointEntry] = {}
+        self._lock = threading.Lock()
+        self._file = None
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        skipped = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    entry = codec.decode(line, codec.CheckpointEntry)
+                except codec.DecodeError:
+                    skipped += 1
+                    continue
+                self._entries[(entry.match_id, entry.result.chunk_id)] = entry
+        if skipped:
+            print(f"Warning: Ignored {skipped} unreadable line(s) in checkpoint {self.path}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, match_id: str, chunk_id: str, input_hash: str) -> Optional[Dict[str, Any]]:
+        """Returns the recorded result row, if the interval finished with the same inputs."""
+        entry = self._entries.get((match_id, chunk_id))
+        if entry is None or entry.input_hash != input_hash:
+            return None
+        return codec.to_builtins(entry.result)
+
+    def record(self, match_id: str, input_hash: str, result: Dict[str, Any]):
+        """
+        Durably appends a finished interval. Failed model updates are not
+        recorded, so a rerun retries them.
+        """
+        if is_failed_update(result["analysis_update"]):
+            return
+        entry = codec.CheckpointEntry(match_id, input_hash, codec.convert(result, codec.IntervalResult))
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "ab")
+                if self._file.tell() and not self._ends_with_newline():
+                    self._file.write(b"\n")  # Seal a line torn by a crash.
+            self._file.write(codec.encode(entry) + b"\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._entries[(match_id, entry.result.chunk_id)] = entry
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "CheckpointLog":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,243 @@
+"""
+A resident analysis process reached over a Unix socket.
+
+Starting ipl-analyze pays for the pandas, nltk and Google AI imports, the VADER
+lexicon load and the model client setup before it reads any data. ipl-daemon
+pays that once and keeps the MatchAnalyzer (and its model client, scheduler
+and sentiment analyzer) warm. `ipl-analyze --client` then only sends the job.
+
+Each connection carries one codec.DaemonRequest line and gets one
+codec.DaemonResponse line back. Jobs run on their own threads and share the
+process-wide model scheduler, so concurrent jobs share one quota.
+
+This module only imports the analysis code when a daemon is started, so
+clients stay cheap to start.
+"""
+import argparse
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from ipl_sentiment_betting.utils import codec
+from ipl_sentiment_betting.utils.config import Config
+
+# Recently loaded matches, keyed by (path, mtime, size), kept for repeat jobs.
+MATCH_CACHE_SIZE = 8
+SOCKET_NAME = "ipl-daemon.sock"
+
+
+def default_socket_path() -> str:
+    """
+    The daemon socket: Config.DAEMON_SOCKET if set, otherwise ipl-daemon.sock
+    in a directory only the current user can use: $XDG_RUNTIME_DIR, or an
+    ipl-analyze-<uid> directory in the temp dir.
+    """
+    if Config.DAEMON_SOCKET:
+        return Config.DAEMON_SOCKET
+    return os.path.join(_runtime_dir(), SOCKET_NAME)
+
+
+def _runtime_dir() -> str:
+    return os.getenv("XDG_RUNTIME_DIR") or os.path.join(tempfile.gettempdir(), f"ipl-analyze-{os.getuid()}")
+
+
+def _check_private_dir(directory: str):
+    """Refuses a default socket directory that another user owns or can write to."""
+    st = os.stat(directory)
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f"{directory} must be owned by and private to the current user")
+
+
+def send_request(request: codec.DaemonRequest, socket_path: Optional[str] = None,
+                 timeout: Optional[float] = None) -> codec.DaemonResponse:
+    """
+    Sends one request to the daemon and waits for its response.
+
+    Raises:
+        OSError: If no daemon is listening on the socket.
+    """
+    if socket_path is None:
+        socket_path = default_socket_path()
+        if not Config.DAEMON_SOCKET:
+            _check_private_dir(os.path.dirname(socket_path))
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(codec.encode(request) + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError("the daemon closed the connection without a response")
+    return codec.decode(line, codec.DaemonResponse)
+
+
+def request_analysis(input_path: str, output_path: str, backfill: bool = False,
+                     batch_size: Optional[int] = None, socket_path: Optional[str] = None,
+                     checkpoint_path: str = "") -> codec.DaemonResponse:
+    """Asks the daemon to analyze a chunk file and write the report to output_path."""
+    request = codec.DaemonRequest(
+        "analyze", input_path=input_path, output_path=output_path,
+        backfill=backfill, batch_size=batch_size, checkpoint_path=checkpoint_path,
+    )
+    return send_request(request, socket_path)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            request = codec.decode(line, codec.DaemonRequest)
+        except codec.DecodeError as e:
+            response = codec.DaemonResponse(ok=False, message=f"Bad request: {e}")
+        else:
+            response = self.server.analysis_daemon.handle(request)
+        self.wfile.write(codec.encode(response) + b"\n")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class AnalysisDaemon:
+    """
+    Serves analysis jobs on a Unix socket with one warm MatchAnalyzer.
+
+    Args:
+        socket_path: Where to listen (default: default_socket_path()).
+        analyzer: The analyzer to serve with; created on start if omitted.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, analyzer: Any = None):
+        self._default_path = socket_path is None and not Config.DAEMON_SOCKET
+        self.socket_path = socket_path or default_socket_path()
+        self.analyzer = analyzer
+        self.jobs_served = 0
+        self._matches: "OrderedDict[Tuple[str, int, int], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+
+    def start(self):
+        """Loads the analysis stack and binds the socket."""
+        if self.analyzer is None:
+            from ipl_sentiment_betting.core.analyzer import MatchAnalyzer
+            self.analyzer = MatchAnalyzer()
+
+        if self._default_path:
+            directory = os.path.dirname(self.socket_path)
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            _check_private_dir(directory)
+        if os.path.exists(self.socket_path):
+            try:
+                send_request(codec.DaemonRequest("ping"), self.socket_path, timeout=1)
+            except OSError:
+                os.unlink(self.socket_path)  # Left behind by a daemon that died.
+            else:
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+
+        # Jobs can write reports anywhere this user can, so only this user may
+        # connect: the socket is created private rather than chmod-ed after.
+        old_umask = os.umask(0o077)
+        try:
+            self._server = _Server(self.socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.analysis_daemon = self
+
+    def serve_forever(self):
+        if self._server is None:
+            self.start()
+        print(f"Analysis daemon listening on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+
+    def load_match(self, input_path: str):
+        """Loads a chunk file, reusing the parsed records while the file is unchanged."""
+        from ipl_sentiment_betting.core.records import load_match
+
+        stat = os.stat(input_path)
+        key = (input_path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            match_data = self._matches.get(key)
+            if match_data is not None:
+                self._matches.move_to_end(key)
+                return match_data
+        match_data = load_match(input_path)
+        with self._lock:
+            self._matches[key] = match_data
+            while len(self._matches) > MATCH_CACHE_SIZE:
+                self._matches.popitem(last=False)
+        return match_data
+
+    def handle(self, request: codec.DaemonRequest) -> codec.DaemonResponse:
+        """Runs one request. Errors are reported in the response, never raised."""
+        if request.command == "ping":
+            return codec.DaemonResponse(ok=True, message=f"pong ({self.jobs_served} jobs served)")
+        if request.command == "shutdown":
+            # shutdown() blocks until serve_forever returns, so let this response go out first.
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return codec.DaemonResponse(ok=True, message="Shutting down.")
+        if request.command != "analyze":
+            return codec.DaemonResponse(ok=False, message=f"Unknown command: {request.command!r}")
+
+        from ipl_sentiment_betting.main import run_batch
+
+        started = time.perf_counter()
+        try:
+            match_data = self.load_match(request.input_path)
+            updates_df = run_batch(
+                self.analyzer, match_data, request.output_path,
+                backfill=request.backfill, batch_size=request.batch_size,
+                checkpoint_path=request.checkpoint_path or None, raise_errors=True,
+            )
+        except Exception as e:
+            print(f"Error analyzing {request.input_path}: {e}")
+            return codec.DaemonResponse(ok=False, message=str(e))
+
+        with self._lock:
+            self.jobs_served += 1
+        return codec.DaemonResponse(
+            ok=True,
+            message=f"Results saved to {request.output_path}",
+            intervals=len(updates_df),
+            elapsed=time.perf_counter() - started,
+        )
+
+
+def main():
+    """Runs the analysis daemon, or stops/pings a running one."""
+    parser = argparse.ArgumentParser(description="Resident IPL analysis daemon.")
+    parser.add_argument("command", nargs="?", choices=["serve", "ping", "stop"], default="serve")
+    parser.add_argument("--socket", type=str, default=None, help="Socket path (default: IPL_DAEMON_SOCKET, or a per-user runtime directory).")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        try:
+            AnalysisDaemon(args.socket).serve_forever()
+        except KeyboardInterrupt:
+            print("\nStopped.")
+        return
+
+    command = "ping" if args.command == "ping" else "shutdown"
+    try:
+        response = send_request(codec.DaemonRequest(command), args.socket, timeout=5)
+    except OSError as e:
+        print(f"No daemon reachable: {e}")
+        raise SystemExit(1)
+    print(response.message)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+import argparse
+import asyncio
+import math
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ipl_sentiment_betting.core.checkpoint import is_failed_update
+from ipl_sentiment_betting.core.records import Ball, Chunk, Comment, OddsSnapshot, parse_timestamp
+from ipl_sentiment_betting.core.scheduler import JobOptions, interval_priority
+from ipl_sentiment_betting.utils import codec
+
+# Layout of a live feed directory. Each feed is append-only JSON Lines, one
+# codec struct per line (BallEvent, CommentEntry or OddsEntry).
+FEED_SCHEMAS = {
+    "balls": codec.BallEvent,
+    "comments": codec.CommentEntry,
+    "odds": codec.OddsEntry,
+}
+MATCH_INFO_FILE = "match_info.json"
+# Written by the producer once every feed is complete.
+END_MARKER = "END"
+
+
+def feed_path(feed_dir: Path, kind: str) -> Path:
+    return Path(feed_dir) / f"{kind}.jsonl"
+
+
+class MatchClock:
+    """
+    Maps wall-clock time to match time.
+
+    At speed 1 the feeds are a real match, whose timestamps are epoch seconds,
+    so match time is the system clock. A session started partway through a
+    match (e.g. a restart with feed already written) then sees the intervals
+    that have already ended as past due, rather than replaying them at 5
+    minutes each and running behind for the rest of the match. At any other
+    speed the clock is anchored on the first event seen, to follow an
+    accelerated replay of a recorded match.
+    """
+
+    def __init__(self, speed: float = 1.0):
+        self.speed = speed
+        self.origin: Optional[float] = None
+        self._wall_origin = 0.0
+
+    def anchor(self, match_time: float) -> None:
+        if self.origin is None:
+            self.origin = match_time
+            self._wall_origin = time.monotonic()
+            if self.speed == 1:
+                self._wall_origin -= time.time() - match_time
+
+    def now(self) -> float:
+        return self.origin + (time.monotonic() - self._wall_origin) * self.speed
+
+    def wall_time(self, match_time: float) -> float:
+        """Returns the time.monotonic() value at which the clock reaches match_time."""
+        return self._wall_origin + (match_time - self.origin) / self.speed
+
+
+async def tail_jsonl(path: Path, schema: Any, poll_interval: float, finished: Callable[[], bool]):
+    """
+    Yields decoded records appended to a JSON Lines file, like `tail -f`.
+
+    Waits for the file to appear, only yields complete lines, and stops once
+    finished() is true and everything written so far has been read.
+    """
+    handle = None
+    buffer = b""
+    try:
+        while True:
+            if handle is None and path.exists():
+                handle = open(path, "rb")
+            data = handle.read() if handle is not None else b""
+            if data:
+                buffer += data
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield codec.decode(line, schema)
+                    except codec.DecodeError as e:
+                        print(f"Warning: Skipping malformed line in {path.name}: {e}")
+            elif finished():
+                return
+            else:
+                await asyncio.sleep(poll_interval)
+    finally:
+        if handle is not None:
+            handle.close()
+
+
+class LatencyStats:
+    """Collects end-of-interval-to-signal latencies in seconds."""
+
+    def __init__(self):
+        self.samples: List[float] = []
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+    def summary(self) -> str:
+        if not self.samples:
+            return "No signals emitted."
+        return (f"{len(self.samples)} signals, latency p50 {self.percentile(50):.2f}s, "
+                f"p95 {self.percentile(95):.2f}s, max {max(self.samples):.2f}s")
+
+
+class LiveSession:
+    """
+    Consumes live feeds, closes intervals on schedule and emits one analysis
+    signal per interval.
+
+    Events are bucketed by their own timestamps into fixed intervals of match
+    time. When the clock passes an interval's end the interval is closed and
+    queued for analysis. The local summaries always run, but the model update
+    is abandoned once it would exceed latency_budget seconds since the end of
+    the interval, so every signal is emitted within a bounded delay. Intervals
+    that were already past due when the session caught up with the feeds are
+    emitted at once with the local summaries only, and their latency shows how
+    late they were. Model requests go through the analyzer's scheduler with
+    the interval's priority and that same deadline, so overlapping matches
+    share one quota.
+    """
+
+    def __init__(self, analyzer, feed_dir: str, team1_info: Dict[str, Any], team2_info: Dict[str, Any],
+                 interval_seconds: float = 300.0, speed: float = 1.0, latency_budget: float = 30.0,
+                 poll_interval: float = 0.2, on_signal: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.analyzer = analyzer
+        self.feed_dir = Path(feed_dir)
+        self.team1_info = team1_info
+        self.team2_info = team2_info
+        self.interval_seconds = interval_seconds
+        self.latency_budget = latency_budget
+        self.poll_interval = poll_interval
+        self.on_signal = on_signal
+        self.clock = MatchClock(speed)
+        self.latency = LatencyStats()
+        self.results: List[Dict[str, Any]] = []
+        self.late_events = 0
+
+        self._buckets: Dict[int, Dict[str, list]] = {}
+        self._next_to_close = 0
+        self._feeds_done = False
+        # Created in run(): on Python 3.9 an Event binds to the loop current
+        # at creation, which is not the one asyncio.run() starts.
+        self._new_event: Optional[asyncio.Event] = None
+        self._done_event: Optional[asyncio.Event] = None
+
+    def _feeds_finished(self) -> bool:
+        return (self.feed_dir / END_MARKER).exists()
+
+    def _interval_index(self, timestamp: float) -> int:
+        return int((timestamp - self.clock.origin) // self.interval_seconds)
+
+    def _ingest(self, kind: str, item: Any) -> None:
+        if kind == "balls":
+            record = Ball.from_schema(item)
+        elif kind == "comments":
+            record = Comment.from_schema(item)
+        else:
+            record = OddsSnapshot.from_schema(item)
+        if not record.timestamp:
+            return
+        self.clock.anchor(record.timestamp)
+
+        index = self._interval_index(record.timestamp)
+        if index < self._next_to_close:
+            # The interval it belongs to has already been emitted.
+            self.late_events += 1
+            index = self._next_to_close
+        bucket = self._buckets.setdefault(index, {"balls": [], "comments": [], "odds": []})
+        bucket[kind].append(record)
+        self._new_event.set()
+
+    async def _consume(self, kind: str) -> None:
+        path = feed_path(self.feed_dir, kind)
+        async for item in tail_jsonl(path, FEED_SCHEMAS[kind], self.poll_interval, self._feeds_finished):
+            self._ingest(kind, item)
+
+    def _build_chunk(self, index: int) -> Optional[Chunk]:
+        bucket = self._buckets.pop(index, None)
+        if not bucket or not any(bucket.values()):
+            return None
+        start = self.clock.origin + index * self.interval_seconds
+        for records in bucket.values():
+            records.sort(key=lambda r: r.timestamp)
+        # Analysis reads the latest odds first, as in the chunk files.
+        bucket["odds"].reverse()
+        return Chunk(f"interval_{index + 1}", int(start), int(start + self.interval_seconds),
+                     balls=bucket["balls"], comments=bucket["comments"], odds=bucket["odds"])
+
+    async def _wait_for_feeds(self, timeout: float) -> bool:
+        """Sleeps for up to timeout seconds; returns True if the feeds finished meanwhile."""
+        try:
+            await asyncio.wait_for(self._done_event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _close_intervals(self, queue: asyncio.Queue) -> None:
+        while True:
+            if self.clock.origin is None:
+                if self._feeds_done:
+                    break
+                self._new_event.clear()
+                await self._new_event.wait()
+                continue
+
+            if not self._feeds_done:
+                end = self.clock.origin + (self._next_to_close + 1) * self.interval_seconds
+                delay = self.clock.wall_time(end) - time.monotonic()
+                if delay > 0 and await self._wait_for_feeds(delay):
+                    continue
+                # Let the tails pick up anything written right at the boundary.
+                await asyncio.sleep(self.poll_interval)
+                closed_at = self.clock.wall_time(end)
+            elif self._buckets:
+                # Feeds are complete: flush what is left without waiting on the clock.
+                closed_at = time.monotonic()
+            else:
+                break
+
+            chunk = self._build_chunk(self._next_to_close)
+            self._next_to_close += 1
+            if chunk is not None:
+                await queue.put((chunk, closed_at))
+        await queue.put(None)
+
+    async def _analyze(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        history: List[str] = []
+        previous: Optional[Chunk] = None
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            chunk, closed_at = item
+            options = JobOptions(
+                priority=interval_priority(chunk, previous),
+                key=str(self.feed_dir),
+                deadline=closed_at + self.latency_budget,
+            )
+            previous = chunk
+
+            local = await loop.run_in_executor(
+                None, self.analyzer.summarize_chunk, chunk, self.team1_info, self.team2_info
+            )
+            remaining = self.latency_budget - (time.monotonic() - closed_at)
+            update_text = (f"AI analysis unavailable: the model did not respond within the "
+                           f"{self.latency_budget:.0f}s latency budget.")
+            if remaining > 0:
+                update_future = loop.run_in_executor(
+                    None, lambda: self.analyzer.generate_match_update(
+                        local["ball_by_ball_summary"], local["odds_summary"], local["sentiment_data"],
+                        self.team1_info["name"], self.team2_info["name"], match_history=list(history),
+                        options=options,
+                    )
+                )
+                try:
+                    update_text = await asyncio.wait_for(update_future, timeout=remaining)
+                    if not is_failed_update(update_text):
+                        history.append(update_text)
+                except asyncio.TimeoutError:
+                    pass
+
+            latency = time.monotonic() - closed_at
+            self.latency.add(latency)
+            result = {
+                "chunk_id": chunk.name,
+                "ball_by_ball_summary": local["ball_by_ball_summary"],
+                "odds_summary": local["odds_summary"],
+                "sentiment_summary": local["sentiment_data"]["summary"],
+                "analysis_update": update_text,
+                "latency_seconds": latency,
+            }
+            self.results.append(result)
+            if self.on_signal:
+                self.on_signal(result)
+
+    async def run(self) -> List[Dict[str, Any]]:
+        """Runs until the feeds are finished and every interval has been emitted."""
+        self._new_event = asyncio.Event()
+        self._done_event = asyncio.Event()
+        queue: asyncio.Queue = asyncio.Queue()
+        closer = asyncio.create_task(self._close_intervals(queue))
+        analyst = asyncio.create_task(self._analyze(queue))
+
+        await asyncio.gather(*(self._consume(kind) for kind in FEED_SCHEMAS))
+        self._feeds_done = True
+        self._new_event.set()
+        self._done_event.set()
+
+        await asyncio.gather(closer, analyst)
+        return self.results
+
+
+def load_feed_match_info(feed_dir: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Reads the team info written alongside the feeds, if any."""
+    path = Path(feed_dir) / MATCH_INFO_FILE
+    if not path.exists():
+        return {"name": "Team 1", "xi": []}, {"name": "Team 2", "xi": []}
+    info = codec.read_json(path, codec.MatchInfo)
+    return codec.to_builtins(info.team1), codec.to_builtins(info.team2)
+
+
+async def replay_match(match_file: str, feed_dir: str, speed: float = 60.0) -> int:
+    """
+    Replays a recorded chunk file into live feeds at an accelerated speed.
+
+    Every ball, comment and odds update is appended to its feed at the moment
+    it happened, scaled by speed, and the END marker is written at the end.
+
+    Returns:
+        The number of events written.
+    """
+    document = codec.read_json(match_file, codec.ChunkFile)
+    feed_dir = Path(feed_dir)
+    feed_dir.mkdir(parents=True, exist_ok=True)
+    for kind in FEED_SCHEMAS:
+        feed_path(feed_dir, kind).unlink(missing_ok=True)
+    (feed_dir / END_MARKER).unlink(missing_ok=True)
+    codec.write_json(feed_dir / MATCH_INFO_FILE, document.match_info)
+
+    events = []
+    seen_odds = set()
+    for chunk in document.chunks:
+        events.extend((parse_timestamp(b.updated_at), "balls", b) for b in chunk.balls)
+        events.extend((parse_timestamp(c.timestamp), "comments", c) for c in chunk.comments)
+        for odds in chunk.odds:
+            if odds.last_update not in seen_odds:
+                seen_odds.add(odds.last_update)
+                events.append((parse_timestamp(odds.last_update), "odds", odds))
+    events = [e for e in events if e[0]]
+    events.sort(key=lambda e: e[0])
+
+    handles = {kind: open(feed_path(feed_dir, kind), "ab") for kind in FEED_SCHEMAS}
+    try:
+        if events:
+            first = events[0][0]
+            wall_start = time.monotonic()
+            for timestamp, kind, item in events:
+                delay = wall_start + (timestamp - first) / speed - time.monotonic()
+                if delay > 0:
+                    for handle in handles.values():
+                        handle.flush()
+                    await asyncio.sleep(delay)
+                handles[kind].write(codec.encode(item) + b"\n")
+    finally:
+        for handle in handles.values():
+            handle.close()
+    (feed_dir / END_MARKER).touch()
+    return len(events)
+
+
+def replay_main():
+    """Command-line entry point for replaying a recorded match into live feeds."""
+    parser = argparse.ArgumentParser(description="Replay a recorded IPL match into live feed files.")
+    parser.add_argument("input_path", type=str, help="Path to the match chunk JSON file.")
+    parser.add_argument("feed_dir", type=str, help="Directory to write the live feeds to.")
+    parser.add_argument("--speed", type=float, default=60.0, help="Replay speed multiplier (default: 60).")
+    args = parser.parse_args()
+
+    print(f"Replaying {args.input_path} into {args.feed_dir} at {args.speed:g}x...")
+    count = asyncio.run(replay_match(args.input_path, args.feed_dir, args.speed))
+    print(f"Replay complete: {count} events written.")
+
+
+if __name__ == "__main__":
+    replay_main()
@@ -0,0 +1,252 @@
+import sys
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ipl_sentiment_betting.utils import codec
+
+# All match data is recorded in Indian Standard Time.
+IST = timezone(timedelta(hours=5, minutes=30))
+
+TIMESTAMP_FORMAT_IST = "%Y-%m-%d %I:%M:%S %p"
+TIMESTAMP_FORMAT_ISO = "%Y-%m-%dT%H:%M:%S%z"
+
+
+@lru_cache(maxsize=8192)
+def parse_timestamp(value: Optional[str]) -> int:
+    """
+    Converts a timestamp string from the data files into epoch seconds.
+
+    Handles the IST wall-clock format used in the chunk files (with or without
+    a trailing "IST") and ISO 8601 timestamps with an offset or a "Z" suffix.
+
+    Args:
+        value: The timestamp string.
+
+    Returns:
+        Seconds since the epoch, or 0 if the value is missing or unparseable.
+    """
+    if not value or not isinstance(value, str):
+        return 0
+    text = value.strip()
+    if text.endswith(" IST"):
+        text = text[:-4]
+    try:
+        return int(datetime.strptime(text, TIMESTAMP_FORMAT_IST).replace(tzinfo=IST).timestamp())
+    except ValueError:
+        pass
+    try:
+        iso = text.replace(".000000", "").replace("Z", "+00:00")
+        return int(datetime.strptime(iso, TIMESTAMP_FORMAT_ISO).timestamp())
+    except ValueError:
+        return 0
+
+
+def format_timestamp(timestamp: int) -> str:
+    """Renders epoch seconds in the IST format used throughout the data files."""
+    if not timestamp:
+        return "unknown time"
+    return datetime.fromtimestamp(timestamp, IST).strftime(TIMESTAMP_FORMAT_IST) + " IST"
+
+
+def _name(value: Optional[str], default: str = "") -> str:
+    """Interns a name so repeated player/team strings share one object."""
+    return sys.intern(value) if value else default
+
+
+class Comment:
+    """A single Reddit comment."""
+
+    __slots__ = ("timestamp", "text", "upvotes")
+
+    def __init__(self, timestamp: int, text: str, upvotes: int = 0):
+        self.timestamp = timestamp
+        self.text = text
+        self.upvotes = upvotes
+
+    @classmethod
+    def from_schema(cls, entry: codec.CommentEntry) -> "Comment":
+        return cls(parse_timestamp(entry.timestamp), entry.comment, entry.upvotes)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Comment":
+        return cls.from_schema(codec.convert(data, codec.CommentEntry))
+
+    def __repr__(self) -> str:
+        return f"Comment({self.timestamp}, {self.text!r}, {self.upvotes})"
+
+
+class Ball:
+    """A single delivery, flattened from the nested Sportmonks structure."""
+
+    __slots__ = (
+        "ball", "timestamp", "team_id", "team", "score_name", "runs",
+        "four", "six", "bye", "leg_bye", "is_wicket", "is_valid", "out",
+        "batsman_id", "batsman", "bowler_id", "bowler",
+    )
+
+    def __init__(self, ball: Optional[float], timestamp: int, team_id: Optional[int], team: str,
+                 score_name: str, runs: int, four: bool, six: bool, bye: int, leg_bye: int,
+                 is_wicket: bool, is_valid: bool, out: bool,
+                 batsman_id: Optional[int], batsman: str, bowler_id: Optional[int], bowler: str):
+        self.ball = ball
+        self.timestamp = timestamp
+        self.team_id = team_id
+        self.team = team
+        self.score_name = score_name
+        self.runs = runs
+        self.four = four
+        self.six = six
+        self.bye = bye
+        self.leg_bye = leg_bye
+        self.is_wicket = is_wicket
+        self.is_valid = is_valid
+        self.out = out
+        self.batsman_id = batsman_id
+        self.batsman = batsman
+        self.bowler_id = bowler_id
+        self.bowler = bowler
+
+    @classmethod
+    def from_schema(cls, event: codec.BallEvent) -> "Ball":
+        score = event.score
+        return cls(
+            event.ball,
+            parse_timestamp(event.updated_at),
+            event.id,
+            _name(event.name),
+            _name(score.name),
+            score.runs,
+            score.four,
+            score.six,
+            score.bye,
+            score.leg_bye,
+            score.is_wicket,
+            score.ball,
+            score.out,
+            event.batsman.id,
+            _name(event.batsman.fullname),
+            event.bowler.id,
+            _name(event.bowler.fullname),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Ball":
+        return cls.from_schema(codec.convert(data, codec.BallEvent))
+
+    def __repr__(self) -> str:
+        return f"Ball({self.ball}, {self.team!r}, {self.score_name!r}, runs={self.runs})"
+
+
+class OddsSnapshot:
+    """Bookmaker prices at a point in time, as (team name, decimal price) pairs."""
+
+    __slots__ = ("timestamp", "prices")
+
+    def __init__(self, timestamp: int, prices: Tuple[Tuple[str, float], ...]):
+        self.timestamp = timestamp
+        self.prices = prices
+
+    @classmethod
+    def from_schema(cls, entry: codec.OddsEntry) -> "OddsSnapshot":
+        prices = tuple((_name(o.name), o.price) for o in entry.odds)
+        return cls(parse_timestamp(entry.last_update), prices)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OddsSnapshot":
+        return cls.from_schema(codec.convert(data, codec.OddsEntry))
+
+    def __repr__(self) -> str:
+        return f"OddsSnapshot({self.timestamp}, {self.prices!r})"
+
+
+class Chunk:
+    """One analysis interval of a match."""
+
+    __slots__ = (
+        "name", "start_time", "end_time", "is_pregame", "is_innings_break",
+        "balls", "comments", "odds",
+    )
+
+    def __init__(self, name: str, start_time: int, end_time: int, is_pregame: bool = False,
+                 is_innings_break: bool = False, balls: Optional[List[Ball]] = None,
+                 comments: Optional[List[Comment]] = None, odds: Optional[List[OddsSnapshot]] = None):
+        self.name = name
+        self.start_time = start_time
+        self.end_time = end_time
+        self.is_pregame = is_pregame
+        self.is_innings_break = is_innings_break
+        self.balls = balls if balls is not None else []
+        self.comments = comments if comments is not None else []
+        self.odds = odds if odds is not None else []
+
+    @classmethod
+    def from_schema(cls, entry: codec.ChunkEntry, default_name: str = "") -> "Chunk":
+        return cls(
+            _name(entry.name, default_name),
+            parse_timestamp(entry.start_time),
+            parse_timestamp(entry.end_time),
+            entry.is_pregame,
+            entry.is_innings_break,
+            [Ball.from_schema(b) for b in entry.balls],
+            [Comment.from_schema(c) for c in entry.comments],
+            [OddsSnapshot.from_schema(o) for o in entry.odds],
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], default_name: str = "") -> "Chunk":
+        return cls.from_schema(codec.convert(data, codec.ChunkEntry), default_name)
+
+    def __repr__(self) -> str:
+        return (f"Chunk({self.name!r}, balls={len(self.balls)}, "
+                f"comments={len(self.comments)}, odds={len(self.odds)})")
+
+
+class Match:
+    """A whole match: team info plus its ordered list of chunks."""
+
+    __slots__ = ("match_id", "team1_info", "team2_info", "chunks")
+
+    def __init__(self, match_id: str, team1_info: Dict[str, Any], team2_info: Dict[str, Any],
+                 chunks: List[Chunk]):
+        self.match_id = match_id
+        self.team1_info = team1_info
+        self.team2_info = team2_info
+        self.chunks = chunks
+
+    @classmethod
+    def from_schema(cls, document: codec.ChunkFile, match_id: str = "") -> "Match":
+        chunks = [
+            Chunk.from_schema(chunk, f"chunk_{i+1}")
+            for i, chunk in enumerate(document.chunks)
+        ]
+        info = document.match_info
+        return cls(match_id, _team(info.team1), _team(info.team2), chunks)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], match_id: str = "") -> "Match":
+        return cls.from_schema(codec.convert(data, codec.ChunkFile), match_id)
+
+    def __repr__(self) -> str:
+        return (f"Match({self.match_id!r}, {self.team1_info['name']!r} vs "
+                f"{self.team2_info['name']!r}, chunks={len(self.chunks)})")
+
+
+def _team(info: codec.TeamInfo) -> Dict[str, Any]:
+    return {"name": _name(info.name), "xi": [_name(p) for p in info.xi]}
+
+
+def load_match(file_path: str) -> Match:
+    """
+    Loads a match chunk file into compact records, validating it against the
+    chunk file schema while parsing.
+
+    Args:
+        file_path: Path to a chunk JSON file (e.g. data/chunks/1.json).
+
+    Returns:
+        The match, identified by the file's stem.
+    """
+    document = codec.read_json(file_path, codec.ChunkFile)
+    return Match.from_schema(document, match_id=Path(file_path).stem)
@@ -0,0 +1,275 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+from ipl_sentiment_betting.analysis.metrics import compute_ball_metrics, odds_for_teams
+from ipl_sentiment_betting.core.records import Chunk
+from ipl_sentiment_betting.utils.config import Config
+
+# Rough prompt-size estimate used for the token budget (Gemini averages about
+# four characters per token), plus an allowance for the response.
+CHARS_PER_TOKEN = 4
+RESPONSE_TOKEN_ALLOWANCE = 500
+
+# Interval priority weights: match phase sets the base, events add urgency.
+PHASE_PRIORITY = {"pregame": 0.0, "innings_break": 1.0, "powerplay": 3.0, "middle": 2.0, "death": 5.0}
+WICKET_PRIORITY = 3.0
+BOUNDARY_PRIORITY = 0.5
+ODDS_SWING_PRIORITY = ((0.10, 4.0), (0.05, 2.0))  # (relative price move, bonus), largest first
+
+
+def estimate_tokens(prompt: str, max_output_tokens: Optional[int] = None) -> int:
+    """Estimates a request's tokens: the prompt plus the response it may produce."""
+    return len(prompt) // CHARS_PER_TOKEN + (max_output_tokens or RESPONSE_TOKEN_ALLOWANCE)
+
+
+def match_phase(chunk: Chunk) -> str:
+    """Classifies an interval as pregame, innings_break, powerplay, middle or death."""
+    if chunk.is_pregame:
+        return "pregame"
+    if chunk.is_innings_break:
+        return "innings_break"
+    last_over = compute_ball_metrics(chunk.balls)["last_over"] if chunk.balls else None
+    if last_over is None:
+        return "middle"
+    # Over numbers start at 0: overs 0-5 are the powerplay, 15-19 the death overs.
+    if last_over < 6:
+        return "powerplay"
+    if last_over >= 15:
+        return "death"
+    return "middle"
+
+
+def interval_priority(chunk: Chunk, previous: Optional[Chunk] = None) -> float:
+    """
+    Scores how urgent an interval's model update is; higher runs first.
+
+    Death overs rank above the powerplay, which ranks above the middle overs,
+    the innings break and pre-game chatter. Wickets, boundaries and a large
+    move in any team's price since the previous interval add to the score.
+    """
+    priority = PHASE_PRIORITY[match_phase(chunk)]
+    if chunk.balls:
+        metrics = compute_ball_metrics(chunk.balls)
+        priority += WICKET_PRIORITY * metrics["wickets"]
+        priority += BOUNDARY_PRIORITY * (metrics["fours"] + metrics["sixes"])
+
+    if previous is not None and chunk.odds and previous.odds:
+        names = [name for name, _ in chunk.odds[0].prices]
+        current = odds_for_teams(chunk.odds, names)
+        before = odds_for_teams(previous.odds, names)
+        swing = max(
+            (abs(c - b) / b for c, b in zip(current, before) if c and b),
+            default=0.0,
+        )
+        for threshold, bonus in ODDS_SWING_PRIORITY:
+            if swing >= threshold:
+                priority += bonus
+                break
+    return priority
+
+
+class JobDropped(Exception):
+    """Raised from a job's future when the scheduler discards it unrun."""
+
+
+class JobOptions:
+    """
+    How a model request is scheduled.
+
+    Args:
+        priority: Higher values are dispatched first.
+        key: Jobs sharing a key (e.g. one match) coalesce: a newer job
+            supersedes pending older ones of equal or lower priority.
+        deadline: time.monotonic() value after which the job is dropped
+            rather than sent.
+        max_output_tokens: The response limit the request is sent with, for
+            the token budget (default: RESPONSE_TOKEN_ALLOWANCE).
+    """
+
+    __slots__ = ("priority", "key", "deadline", "max_output_tokens")
+
+    def __init__(self, priority: float = 0.0, key: Any = None, deadline: Optional[float] = None,
+                 max_output_tokens: Optional[int] = None):
+        self.priority = priority
+        self.key = key
+        self.deadline = deadline
+        self.max_output_tokens = max_output_tokens
+
+
+class _Job:
+    __slots__ = ("priority", "seq", "key", "deadline", "tokens", "call", "prompt", "future")
+
+    def __init__(self, seq: int, options: JobOptions, call: Callable[[str], Any], prompt: str):
+        self.priority = options.priority
+        self.key = options.key
+        self.deadline = options.deadline
+        self.seq = seq
+        self.tokens = estimate_tokens(prompt, options.max_output_tokens)
+        self.call = call
+        self.prompt = prompt
+        self.future: Future = Future()
+
+    def __lt__(self, other: "_Job") -> bool:
+        return (-self.priority, self.seq) < (-other.priority, other.seq)
+
+
+class LLMScheduler:
+    """
+    Dispatches model requests from any number of matches against one shared
+    request and token budget.
+
+    Pending jobs are dispatched highest priority first (FIFO within a
+    priority). Requests are spaced to stay within requests_per_minute, and the
+    estimated tokens sent over any 60 seconds stay within tokens_per_minute.
+    Jobs past their deadline, or superseded by a newer job with the same key,
+    are dropped without being sent, so a backlog cannot delay the important
+    intervals indefinitely.
+    """
+
+    def __init__(self, requests_per_minute: float = 60, tokens_per_minute: Optional[int] = None,
+                 max_concurrent: int = 1):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrent = max_concurrent
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "stale": 0, "superseded": 0}
+
+        self._heap: List[_Job] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._next_slot = 0.0
+        self._token_log: Deque[Tuple[float, int]] = deque()
+        self._workers: List[threading.Thread] = []
+
+    def submit(self, call: Callable[[str], Any], prompt: str, options: Optional[JobOptions] = None) -> Future:
+        """
+        Queues call(prompt) and returns a future for its result.
+
+        The future raises JobDropped if the job is discarded before it is sent.
+        """
+        job = _Job(next(self._seq), options or JobOptions(), call, prompt)
+        with self._cond:
+            self.stats["submitted"] += 1
+            if job.key is not None:
+                self._supersede(job)
+            heapq.heappush(self._heap, job)
+            self._start_workers()
+            self._cond.notify()
+        return job.future
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def _start_workers(self):
+        while len(self._workers) < self.max_concurrent:
+            worker = threading.Thread(target=self._run, name="llm-scheduler", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _supersede(self, job: _Job):
+        kept = []
+        for pending in self._heap:
+            if pending.key == job.key and pending.priority <= job.priority:
+                self._drop(pending, "superseded", "superseded by a newer interval")
+            else:
+                kept.append(pending)
+        if len(kept) != len(self._heap):
+            self._heap = kept
+            heapq.heapify(self._heap)
+
+    def _drop(self, job: _Job, stat: str, reason: str):
+        self.stats[stat] += 1
+        if job.future.set_running_or_notify_cancel():
+            job.future.set_exception(JobDropped(reason))
+
+    def _drop_stale(self, now: float):
+        kept = []
+        for job in self._heap:
+            if job.future.cancelled():
+                continue
+            if job.deadline is not None and job.deadline <= now:
+                self._drop(job, "stale", "the interval went stale before a request slot was free")
+            else:
+                kept.append(job)
+        if len(kept) != len(self._heap):
+            self._heap = kept
+            heapq.heapify(self._heap)
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        """Seconds until a request of this size fits within both budgets."""
+        wait = self._next_slot - now
+        if self.tokens_per_minute is not None:
+            while self._token_log and self._token_log[0][0] <= now - 60:
+                self._token_log.popleft()
+            used = sum(t for _, t in self._token_log)
+            # A single oversized request is let through once the window is empty.
+            if used and used + tokens > self.tokens_per_minute:
+                for sent_at, sent_tokens in self._token_log:
+                    used -= sent_tokens
+                    if used + tokens <= self.tokens_per_minute:
+                        break
+                wait = max(wait, sent_at + 60 - now)
+        return wait
+
+    def _next_job(self) -> _Job:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._drop_stale(now)
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                wait = self._wait_time(self._heap[0].tokens, now)
+                if wait > 0:
+                    # Woken early if a more urgent job arrives or a deadline passes.
+                    deadlines = [j.deadline - now for j in self._heap if j.deadline is not None]
+                    self._cond.wait(min([wait] + deadlines))
+                    continue
+                job = heapq.heappop(self._heap)
+                self._next_slot = now + 60.0 / self.requests_per_minute
+                if self.tokens_per_minute is not None:
+                    self._token_log.append((now, job.tokens))
+                return job
+
+    def _run(self):
+        while True:
+            job = self._next_job()
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = job.call(job.prompt)
+            except BaseException as e:
+                with self._cond:
+                    self.stats["failed"] += 1
+                job.future.set_exception(e)
+            else:
+                with self._cond:
+                    self.stats["completed"] += 1
+                job.future.set_result(result)
+
+
+_shared_scheduler: Optional[LLMScheduler] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_scheduler() -> LLMScheduler:
+    """
+    Returns the process-wide scheduler every MatchAnalyzer submits to by default.
+
+    The budget is per process: matches share it when they run in one process
+    (`ipl-analyze --live ... --also ...`, or jobs sent to one ipl-daemon).
+    """
+    global _shared_scheduler
+    with _shared_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = LLMScheduler(
+                requests_per_minute=Config.LLM_REQUESTS_PER_MINUTE,
+                tokens_per_minute=Config.LLM_TOKENS_PER_MINUTE,
+                max_concurrent=Config.LLM_MAX_CONCURRENT,
+            )
+        return _shared_scheduler
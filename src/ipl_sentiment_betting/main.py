@@ -1,66 +1,252 @@
 import argparse
-import json
+import os
 import sys
-from ipl_sentiment_betting.core.analyzer import MatchAnalyzer
 
-def save_results_as_markdown(updates_df, output_path, team1_name, team2_name):
-    """Saves the analysis results to a Markdown file."""
+# The analysis modules (pandas, nltk, the Google AI client) are imported inside
+# the functions that need them, so --client invocations stay cheap to start.
+
+def format_interval_markdown(row) -> str:
+    """Formats one analysed interval as a Markdown section."""
+    reactions = ""
+    if row.get("sentiment_reactions"):
+        reactions = f"### Sentiment Reactions\n{row['sentiment_reactions']}\n\n"
+    return (
+        f"## Interval: {row['chunk_id']}\n\n"
+        "### Ball-by-Ball Summary\n"
+        f"{row['ball_by_ball_summary']}\n\n"
+        "### Odds Summary\n"
+        f"{row['odds_summary']}\n\n"
+        f"{reactions}"
+        "### AI-Generated Analysis\n"
+        f"{row['analysis_update']}\n\n"
+        "---\n\n"
+    )
+
+def save_results_as_markdown(updates_df, output_path, team1_name, team2_name, raise_errors=False):
+    """
+    Saves the analysis results to a Markdown file.
+
+    Write errors are printed, or re-raised if raise_errors is set (as the
+    daemon does, so its client is told the report was not written).
+    """
     print("\n--- Saving Results ---")
     try:
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(f"# Match Analysis: {team1_name} vs {team2_name}\n\n")
             
             for _, row in updates_df.iterrows():
-                f.write(f"## Interval: {row['chunk_id']}\n\n")
+                f.write(format_interval_markdown(row))
+        print(f"Results saved to {output_path}")
+    except Exception as e:
+        print(f"Error saving results to Markdown file: {e}")
+        if raise_errors:
+            raise
 
-                f.write("### Ball-by-Ball Summary\n")
-                f.write(f"{row['ball_by_ball_summary']}\n\n")
+def run_batch(analyzer, match_data, output_path, backfill=False, batch_size=None, checkpoint_path=None, profiler=None,
+              raise_errors=False):
+    """
+    Analyzes a recorded match and saves the Markdown report.
 
-                f.write("### Odds Summary\n")
-                f.write(f"{row['odds_summary']}\n\n")
+    Args:
+        analyzer: The MatchAnalyzer to use.
+        match_data: The match records (see records.load_match).
+        output_path: Where to write the report.
+        backfill: Pack several intervals into each model request.
+        batch_size: With backfill, the maximum intervals per request.
+        checkpoint_path: Optional checkpoint log to record finished intervals
+            in and resume from.
+        profiler: Optional utils.profiling.Profiler for the run.
+        raise_errors: Raise if the report cannot be written, rather than
+            only printing the error.
 
-                f.write("### AI-Generated Analysis\n")
-                f.write(f"{row['analysis_update']}\n\n")
+    Returns:
+        The per-interval results.
+    """
+    from ipl_sentiment_betting.core.checkpoint import CheckpointLog
+    from ipl_sentiment_betting.utils.profiling import NULL_PROFILER
 
-                f.write("---\n\n")
-        print(f"Results saved to {output_path}")
-    except Exception as e:
-        print(f"Error saving results to Markdown file: {e}")
+    profiler = profiler or NULL_PROFILER
 
-def main():
-    """Main function to run the enhanced analysis."""
-    parser = argparse.ArgumentParser(description="Run IPL Match Analysis.")
-    parser.add_argument("input_path", type=str, help="Path to the input JSON chunk file.")
-    parser.add_argument("output_path", type=str, help="Path to save the output analysis Markdown file.")
-    args = parser.parse_args()
+    team1_info = match_data.team1_info
+    team2_info = match_data.team2_info
+    print(f"Loaded team info: {team1_info['name']} vs {team2_info['name']}")
+    
+    checkpoint = CheckpointLog(checkpoint_path) if checkpoint_path else None
+    try:
+        if backfill:
+            updates_df = analyzer.process_match_backfill(
+                match_data, team1_info, team2_info, max_batch=batch_size,
+                checkpoint=checkpoint, profiler=profiler,
+            )
+        else:
+            updates_df = analyzer.process_match_data(
+                match_data, team1_info, team2_info, checkpoint=checkpoint, profiler=profiler
+            )
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+
+    with profiler.stage("report"):
+        save_results_as_markdown(updates_df, output_path, team1_info['name'], team2_info['name'], raise_errors)
+    return updates_df
+
+def run_client(args):
+    """
+    Sends the analysis to a running ipl-daemon.
+
+    Returns:
+        False if no daemon is reachable, so the caller can run it in-process.
+    """
+    from ipl_sentiment_betting.core.daemon import request_analysis
 
     try:
-        analyzer = MatchAnalyzer()
-    except Exception as e:
-        print(f"Failed to initialize analyzer: {e}")
+        response = request_analysis(
+            os.path.abspath(args.input_path), os.path.abspath(args.output_path),
+            backfill=args.backfill, batch_size=args.batch_size, socket_path=args.socket,
+            checkpoint_path=os.path.abspath(args.checkpoint) if args.checkpoint else "",
+        )
+    except OSError as e:
+        print(f"Analysis daemon not reachable ({e}); running in-process.")
+        return False
+
+    if not response.ok:
+        print(f"Daemon failed to analyze {args.input_path}: {response.message}")
         sys.exit(1)
+    print(f"{response.message} ({response.intervals} intervals in {response.elapsed:.1f}s)")
+    return True
+
+def run_live(analyzer, args):
+    """
+    Analyzes matches as they happen from live feed directories.
+
+    args.input_path and any --also matches are followed concurrently on one
+    event loop with the one analyzer, so their model requests share the
+    analyzer's scheduler and quota.
+    """
+    import asyncio
+    from contextlib import ExitStack
+    from ipl_sentiment_betting.core.live import LiveSession, load_feed_match_info
+
+    matches = [(args.input_path, args.output_path)] + [tuple(pair) for pair in args.also or []]
+    sessions = []
+    with ExitStack() as stack:
+        for feed_dir, output_path in matches:
+            team1_info, team2_info = load_feed_match_info(feed_dir)
+            label = f"{team1_info['name']} vs {team2_info['name']}"
+            print(f"Following live feeds in {feed_dir}: {label}")
+
+            f = stack.enter_context(open(output_path, 'w', encoding='utf-8'))
+            f.write(f"# Match Analysis: {label}\n\n")
+
+            def on_signal(row, f=f, label=label):
+                print(f"\n--- Signal for {label}, {row['chunk_id']} (latency {row['latency_seconds']:.2f}s) ---")
+                print(f"  - Model Update: {row['analysis_update'].replace(chr(10), ' ')[0:100]}...")
+                f.write(format_interval_markdown(row))
+                f.flush()
+
+            session = LiveSession(
+                analyzer, feed_dir, team1_info, team2_info,
+                interval_seconds=args.interval, speed=args.speed,
+                latency_budget=args.latency_budget, on_signal=on_signal,
+            )
+            sessions.append((session, label, output_path))
+
+        async def run_all():
+            await asyncio.gather(*(session.run() for session, _, _ in sessions))
+
+        try:
+            asyncio.run(run_all())
+        except KeyboardInterrupt:
+            print("\nStopped.")
+
+    for session, label, output_path in sessions:
+        print(f"\n{label}: {session.latency.summary()}")
+        if session.late_events:
+            print(f"{session.late_events} events arrived after their interval closed.")
+        print(f"Results saved to {output_path}")
+
+def run_local(args, profiler=None):
+    """Runs the analysis in this process."""
+    from ipl_sentiment_betting.utils.profiling import NULL_PROFILER
+
+    profiler = profiler or NULL_PROFILER
+    with profiler.stage("startup"):
+        from ipl_sentiment_betting.core.analyzer import MatchAnalyzer
+        from ipl_sentiment_betting.core.records import load_match
+
+        try:
+            analyzer = MatchAnalyzer()
+        except Exception as e:
+            print(f"Failed to initialize analyzer: {e}")
+            sys.exit(1)
+
+    if args.live:
+        run_live(analyzer, args)
+        return
 
     print(f"Processing {args.input_path}...")
     try:
-        with open(args.input_path, 'r') as f:
-            match_data = json.load(f)
+        with profiler.stage("load"):
+            match_data = load_match(args.input_path)
     except Exception as e:
         print(f"Error reading or parsing JSON file: {e}")
         sys.exit(1)
 
-    # Attempt to dynamically load team info from the JSON structure
-    match_info = match_data.get("match_info", {})
-    team1_info = match_info.get("team1", {"name": "Team 1", "xi": []})
-    team2_info = match_info.get("team2", {"name": "Team 2", "xi": []})
-    print(f"Loaded team info: {team1_info['name']} vs {team2_info['name']}")
-    
-    updates_df = analyzer.process_match_data(
-        match_data, team1_info, team2_info
+    run_batch(
+        analyzer, match_data, args.output_path,
+        backfill=args.backfill, batch_size=args.batch_size, checkpoint_path=args.checkpoint,
+        profiler=profiler,
     )
 
-    save_results_as_markdown(updates_df, args.output_path, team1_info['name'], team2_info['name'])
-
     print("\nAnalysis complete.")
 
+def main():
+    """Main function to run the enhanced analysis."""
+    parser = argparse.ArgumentParser(description="Run IPL Match Analysis.")
+    parser.add_argument("input_path", type=str, help="Path to the input JSON chunk file (or the feed directory with --live).")
+    parser.add_argument("output_path", type=str, help="Path to save the output analysis Markdown file.")
+    parser.add_argument("--live", action="store_true", help="Follow live feeds in input_path and emit a signal per interval.")
+    parser.add_argument("--interval", type=float, default=300.0, help="Live interval length in match seconds (default: 300).")
+    parser.add_argument("--speed", type=float, default=1.0, help="Live clock speed, e.g. 60 when following a 60x replay.")
+    parser.add_argument("--also", nargs=2, action="append", metavar=("FEED_DIR", "OUTPUT_PATH"),
+                        help="With --live, also follow another match's feeds in this process, sharing one model quota (repeatable).")
+    parser.add_argument("--latency-budget", type=float, default=30.0, help="Maximum seconds from interval end to signal (default: 30).")
+    parser.add_argument("--backfill", action="store_true", help="Pack several intervals into each model request (historical matches only).")
+    parser.add_argument("--batch-size", type=int, default=None, help="With --backfill, cap intervals per request (default: sized to the request budget).")
+    parser.add_argument("--checkpoint", type=str, default=None, help="Record each finished interval in this file and skip intervals already recorded there.")
+    parser.add_argument("--profile", type=str, nargs="?", const="profile", default=None, metavar="DIR",
+                        help="Profile the run (CPU per stage, peak memory per interval, flame-graph stacks) and write the results to DIR (default: profile/).")
+    parser.add_argument("--profile-top", type=int, default=25, help="Functions and allocation sites listed in the profile report (default: 25).")
+    parser.add_argument("--profile-no-memory", action="store_true", help="With --profile, skip memory tracing, which inflates stage times.")
+    parser.add_argument("--client", action="store_true", help="Run the analysis in a resident ipl-daemon instead of this process.")
+    parser.add_argument("--socket", type=str, default=None, help="With --client, the daemon's socket path (default: IPL_DAEMON_SOCKET, or a per-user runtime directory).")
+    args = parser.parse_args()
+
+    if args.also and not args.live:
+        print("--also only applies with --live; ignoring it.")
+
+    if args.client:
+        if args.live:
+            print("--client does not support --live; running in-process.")
+        elif args.profile:
+            print("--profile runs the analysis in-process.")
+        elif run_client(args):
+            return
+
+    if args.profile and not args.live:
+        from ipl_sentiment_betting.utils.profiling import Profiler
+
+        profiler = Profiler(args.profile, top_n=args.profile_top, trace_memory=not args.profile_no_memory)
+        with profiler:
+            run_local(args, profiler)
+        profiler.write()
+        print(f"\n{profiler.stage_summary()}")
+        print(f"Profile written to {args.profile}/ (report.txt, stacks.collapsed, one .prof per stage)")
+        return
+
+    if args.profile:
+        print("--profile is not supported with --live; running without it.")
+    run_local(args)
+
 if __name__ == "__main__":
     main()
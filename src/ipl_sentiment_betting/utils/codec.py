@@ -0,0 +1,290 @@
+"""
+Typed JSON decoding and compact encoding for every data file in the project.
+
+Each file format has a msgspec schema below. Decoding validates the document
+while it is parsed and yields typed structs instead of nested dicts, and
+encoding writes compact JSON (no indentation or extra whitespace).
+"""
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Type, TypeVar, Union
+
+import msgspec
+
+T = TypeVar("T")
+
+
+# --- Trimmed formats (data/chunks, data/balls, data/odds) ---
+
+class Score(msgspec.Struct):
+    name: str = ""
+    runs: int = 0
+    four: bool = False
+    six: bool = False
+    bye: int = 0
+    leg_bye: int = 0
+    is_wicket: bool = False
+    ball: bool = False
+    out: bool = False
+
+
+class Batsman(msgspec.Struct):
+    fullname: str = "Unknown Batsman"
+    id: Optional[int] = None
+    battingstyle: Optional[str] = None
+
+
+class Bowler(msgspec.Struct):
+    fullname: str = "Unknown Bowler"
+    id: Optional[int] = None
+    bowlingstyle: Optional[str] = None
+
+
+class BallEvent(msgspec.Struct):
+    ball: Optional[float] = None
+    updated_at: Optional[str] = None
+    id: Optional[int] = None
+    name: str = "Unknown"
+    score: Score = msgspec.field(default_factory=Score)
+    batsman: Batsman = msgspec.field(default_factory=Batsman)
+    bowler: Bowler = msgspec.field(default_factory=Bowler)
+
+
+class Outcome(msgspec.Struct):
+    name: str
+    price: float
+
+
+class OddsEntry(msgspec.Struct):
+    odds: List[Outcome] = []
+    last_update: Optional[str] = None
+
+
+class CommentEntry(msgspec.Struct):
+    comment: Optional[str] = None
+    timestamp: Optional[str] = None
+    upvotes: int = 0
+
+
+class InningsBreak(msgspec.Struct):
+    first_innings_end: Optional[str] = None
+    second_innings_start: Optional[str] = None
+
+
+class ChunkEntry(msgspec.Struct):
+    name: Optional[str] = None
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    is_pregame: bool = False
+    is_innings_break: bool = False
+    # Only present on innings-break chunks; UNSET keeps it out of the output.
+    innings_break: Union[InningsBreak, msgspec.UnsetType] = msgspec.UNSET
+    balls: List[BallEvent] = []
+    comments: List[CommentEntry] = []
+    odds: List[OddsEntry] = []
+
+
+class TeamInfo(msgspec.Struct):
+    name: str
+    xi: List[str] = []
+
+
+class MatchInfo(msgspec.Struct):
+    team1: TeamInfo = msgspec.field(default_factory=lambda: TeamInfo("Team 1"))
+    team2: TeamInfo = msgspec.field(default_factory=lambda: TeamInfo("Team 2"))
+
+
+class ChunkFile(msgspec.Struct):
+    """data/chunks/<match>.json"""
+    match_info: MatchInfo = msgspec.field(default_factory=MatchInfo)
+    chunks: List[ChunkEntry] = []
+
+
+class MatchSummary(msgspec.Struct):
+    id: int
+    round: Optional[str] = None
+    localteam_id: Optional[int] = None
+    visitorteam_id: Optional[int] = None
+    starting_at: Optional[str] = None
+    note: Optional[str] = None
+    venue_id: Optional[int] = None
+    toss_won_team_id: Optional[int] = None
+    winner_team_id: Optional[int] = None
+
+
+class BallsFile(msgspec.Struct):
+    """data/balls/<match>.json"""
+    summary: MatchSummary
+    balls: List[BallEvent] = []
+
+
+# data/odds/<match>.json
+OddsFile = List[OddsEntry]
+
+
+# --- Raw API responses (inputs to the extractor scripts) ---
+
+class FixtureTeam(msgspec.Struct):
+    id: int
+    name: str
+
+
+class FixtureBall(msgspec.Struct):
+    ball: float
+    updated_at: str
+    team: FixtureTeam
+    score: Score
+    batsman: Batsman
+    bowler: Bowler
+
+
+class Fixture(msgspec.Struct):
+    id: int
+    round: Optional[str]
+    localteam_id: Optional[int]
+    visitorteam_id: Optional[int]
+    starting_at: Optional[str]
+    note: Optional[str]
+    venue_id: Optional[int]
+    toss_won_team_id: Optional[int]
+    winner_team_id: Optional[int]
+    balls: List[FixtureBall] = []
+
+
+class FixtureResponse(msgspec.Struct):
+    """A Sportmonks /fixtures/<id>?include=balls response."""
+    data: Fixture
+
+
+class Market(msgspec.Struct):
+    outcomes: List[Outcome]
+
+
+class Bookmaker(msgspec.Struct):
+    last_update: str
+    markets: List[Market]
+
+
+class OddsEventData(msgspec.Struct):
+    bookmakers: List[Bookmaker] = []
+
+
+class OddsSnapshotResponse(msgspec.Struct):
+    data: OddsEventData
+
+
+class HistoricalOddsEntry(msgspec.Struct):
+    timestamp: str
+    odds: OddsSnapshotResponse
+
+
+# A file of The Odds API historical snapshots, one per polling timestamp.
+HistoricalOddsFile = List[HistoricalOddsEntry]
+
+
+# --- Model responses ---
+
+class IntervalUpdate(msgspec.Struct):
+    interval_id: str
+    update: str
+
+
+# The structured response to a batched backfill request, one entry per interval.
+BatchResponse = List[IntervalUpdate]
+
+
+# --- Analysis results (checkpoint logs) ---
+
+class IntervalResult(msgspec.Struct):
+    """One analysed interval, as in the rows of MatchAnalyzer.process_match_data."""
+    chunk_id: str
+    ball_by_ball_summary: str = ""
+    odds_summary: str = ""
+    sentiment_summary: str = ""
+    sentiment_reactions: str = ""
+    analysis_update: str = ""
+
+
+class CheckpointEntry(msgspec.Struct):
+    """One line of a checkpoint log (see core/checkpoint.py)."""
+    match_id: str
+    input_hash: str
+    result: IntervalResult
+
+
+# --- Analysis daemon protocol (one JSON line each way) ---
+
+class DaemonRequest(msgspec.Struct):
+    command: str  # "analyze", "ping" or "shutdown"
+    input_path: str = ""
+    output_path: str = ""
+    backfill: bool = False
+    batch_size: Optional[int] = None
+    checkpoint_path: str = ""
+
+
+class DaemonResponse(msgspec.Struct):
+    ok: bool
+    message: str = ""
+    intervals: int = 0
+    elapsed: float = 0.0
+
+
+# --- Decode / encode ---
+
+_decoders: Dict[Any, msgspec.json.Decoder] = {}
+_encoder = msgspec.json.Encoder()
+
+DecodeError = msgspec.DecodeError
+ValidationError = msgspec.ValidationError
+
+
+def _decoder(schema: Any) -> msgspec.json.Decoder:
+    decoder = _decoders.get(schema)
+    if decoder is None:
+        decoder = _decoders[schema] = msgspec.json.Decoder(schema)
+    return decoder
+
+
+def decode(data: Union[bytes, str], schema: Type[T] = Any) -> T:
+    """
+    Parses JSON, validating it against schema while decoding.
+
+    Args:
+        data: The JSON document.
+        schema: The expected type; Any decodes to plain Python objects.
+
+    Returns:
+        The decoded document.
+
+    Raises:
+        DecodeError: If the document is malformed or does not match the schema
+            (ValidationError is a subclass).
+    """
+    return _decoder(schema).decode(data)
+
+
+def convert(obj: Any, schema: Type[T]) -> T:
+    """Validates already-decoded builtins (e.g. dicts) into a schema type."""
+    return msgspec.convert(obj, schema, strict=False)
+
+
+def read_json(file_path: Union[str, Path], schema: Type[T] = Any) -> T:
+    """Reads and decodes a JSON file. See decode."""
+    with open(file_path, "rb") as f:
+        return decode(f.read(), schema)
+
+
+def encode(obj: Any) -> bytes:
+    """Encodes structs and builtins as compact JSON."""
+    return _encoder.encode(obj)
+
+
+def write_json(file_path: Union[str, Path], obj: Any) -> None:
+    """Writes obj to file_path as compact JSON."""
+    with open(file_path, "wb") as f:
+        f.write(encode(obj))
+
+
+def to_builtins(obj: Any) -> Any:
+    """Converts structs back into dicts and lists."""
+    return msgspec.to_builtins(obj)
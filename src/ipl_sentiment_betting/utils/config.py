@@ -9,6 +9,19 @@ class Config:
     
     GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
     
+    # Shared model quota across every match analysed in this process.
+    LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+    LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "0")) or None
+    LLM_MAX_CONCURRENT = int(os.getenv("LLM_MAX_CONCURRENT", "1"))
+
+    # Size limits for one batched backfill request (see core/batching.py).
+    LLM_BATCH_INPUT_TOKENS = int(os.getenv("LLM_BATCH_INPUT_TOKENS", "32000"))
+    LLM_BATCH_OUTPUT_TOKENS = int(os.getenv("LLM_BATCH_OUTPUT_TOKENS", "16384"))
+
+    # Unix socket of the resident analysis daemon (ipl-daemon). When unset, the
+    # daemon picks a per-user path (see core/daemon.py:default_socket_path).
+    DAEMON_SOCKET = os.getenv("IPL_DAEMON_SOCKET")
+    
     @classmethod
     def validate(cls):
         """Validates that all required environment variables are set."""
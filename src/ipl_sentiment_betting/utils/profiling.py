@@ -0,0 +1,235 @@
+"""
+Opt-in profiling for the analysis and chunking scripts (--profile).
+
+A Profiler collects:
+  * a cProfile per named stage (e.g. load, sentiment, model, report),
+  * tracemalloc peak memory per interval and the top allocation sites,
+  * wall-clock stack samples of the profiled thread in collapsed-stack format,
+    for flamegraph.pl, speedscope or inferno,
+and writes them with a plain-text report of the top-N hot functions.
+
+Code paths take a profiler argument that defaults to NULL_PROFILER, whose
+stages and intervals do nothing, so the hooks cost nothing in normal runs.
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_TOP_N = 25
+DEFAULT_SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+# One frame is enough to attribute allocations to a line, and keeps the
+# tracemalloc slowdown (already several times on VADER-heavy stages) down.
+TRACEMALLOC_FRAMES = 1
+
+
+class NullProfiler:
+    """Profiler stand-in for normal runs."""
+
+    enabled = False
+
+    def stage(self, name: str):
+        return nullcontext()
+
+    def interval(self, label: str):
+        return nullcontext()
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class Profiler:
+    """
+    Collects per-stage CPU profiles, per-interval peak memory and collapsed
+    stacks for one run.
+
+    Use as a context manager around the run; stages and intervals are entered
+    from the thread that started it. Stages may nest; a nested stage pauses
+    the enclosing stage's CPU profile, and stage wall times are inclusive.
+
+    Args:
+        output_dir: Where write() puts the profiles and report.
+        top_n: Number of functions and allocation sites in the report.
+        sample_interval: Seconds between stack samples for the flame graph.
+        trace_memory: Track allocations with tracemalloc. This slows
+            allocation-heavy code several times, so turn it off when the stage
+            times themselves are in question.
+    """
+
+    enabled = True
+
+    def __init__(self, output_dir: str, top_n: int = DEFAULT_TOP_N,
+                 sample_interval: float = DEFAULT_SAMPLE_INTERVAL, trace_memory: bool = True):
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.sample_interval = sample_interval
+        self.trace_memory = trace_memory
+
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.stage_times: Dict[str, List[float]] = {}
+        self.interval_memory: List[Tuple[str, int, int]] = []  # (label, peak, retained) bytes
+        self.stacks: Counter = Counter()
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+
+        self._active: List[str] = []
+        self._thread_id: Optional[int] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._started_tracemalloc = False
+        self._started_at = 0.0
+        self.total_time = 0.0
+
+    def start(self):
+        self._thread_id = threading.get_ident()
+        self._started_at = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample, name="profiler-sampler", daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        self.total_time = time.perf_counter() - self._started_at
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        if tracemalloc.is_tracing():
+            self.snapshot = tracemalloc.take_snapshot()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """CPU-profiles and times the enclosed code under a stage name."""
+        profile = self.profiles.get(name)
+        if profile is None:
+            profile = self.profiles[name] = cProfile.Profile()
+        if self._active:
+            self.profiles[self._active[-1]].disable()
+        self._active.append(name)
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.stage_times.setdefault(name, []).append(time.perf_counter() - started)
+            self._active.pop()
+            if self._active:
+                self.profiles[self._active[-1]].enable()
+
+    @contextmanager
+    def interval(self, label: str) -> Iterator[None]:
+        """Records peak and retained traced memory while the enclosed code runs."""
+        if not tracemalloc.is_tracing():
+            yield
+            return
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            self.interval_memory.append((label, peak - before, current - before))
+
+    def _sample(self):
+        while not self._stop.wait(self.sample_interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            try:
+                root = self._active[-1]
+            except IndexError:
+                root = "(no stage)"
+            self.stacks[";".join([root] + names[::-1])] += 1
+
+    def collapsed_stacks(self) -> str:
+        """Stack samples as 'stage;outer;...;inner count' lines."""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+    def stage_summary(self) -> str:
+        """The total and per-stage wall times as a table."""
+        out = io.StringIO()
+        out.write(f"Total wall time: {self.total_time:.2f}s\n\n")
+        out.write("Stages (wall time, inclusive of nested stages):\n")
+        out.write(f"  {'stage':<24}{'calls':>8}{'total s':>10}{'mean ms':>10}{'max ms':>10}\n")
+        for name, times in sorted(self.stage_times.items(), key=lambda item: -sum(item[1])):
+            out.write(f"  {name:<24}{len(times):>8}{sum(times):>10.2f}"
+                      f"{sum(times) / len(times) * 1000:>10.1f}{max(times) * 1000:>10.1f}\n")
+        return out.getvalue()
+
+    def report(self) -> str:
+        """A plain-text summary of stage times, memory and the hottest functions."""
+        out = io.StringIO()
+        out.write(self.stage_summary())
+
+        if self.interval_memory:
+            out.write(f"\nPeak traced memory per interval (top {self.top_n} by peak):\n")
+            ranked = sorted(self.interval_memory, key=lambda item: -item[1])[:self.top_n]
+            for label, peak, retained in ranked:
+                out.write(f"  {label:<24}peak {peak / 2**20:>8.2f} MiB   retained {retained / 2**20:>+8.2f} MiB\n")
+
+        if self.snapshot is not None:
+            out.write(f"\nTop {self.top_n} allocation sites still held at the end:\n")
+            for stat in self.snapshot.statistics("lineno")[:self.top_n]:
+                out.write(f"  {stat}\n")
+
+        if self.profiles:
+            stats = self._combined_stats(out)
+            out.write(f"\nTop {self.top_n} functions by own time (all stages):\n")
+            stats.sort_stats("tottime").print_stats(self.top_n)
+            out.write(f"\nTop {self.top_n} functions by cumulative time (all stages):\n")
+            stats.sort_stats("cumulative").print_stats(self.top_n)
+        return out.getvalue()
+
+    def _combined_stats(self, stream: io.StringIO) -> pstats.Stats:
+        profiles = [p for p in self.profiles.values() if p.getstats()]
+        stats = pstats.Stats(profiles[0], stream=stream) if profiles else pstats.Stats(stream=stream)
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+    def write(self) -> str:
+        """
+        Writes everything to output_dir:
+          * <stage>.prof, one pstats file per stage (e.g. for snakeviz),
+          * stacks.collapsed, for flamegraph.pl / speedscope,
+          * report.txt, the text report.
+
+        Returns:
+            The report text.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        for name, profile in self.profiles.items():
+            if profile.getstats():
+                profile.dump_stats(os.path.join(self.output_dir, f"{_safe_name(name)}.prof"))
+        with open(os.path.join(self.output_dir, "stacks.collapsed"), "w", encoding="utf-8") as f:
+            f.write(self.collapsed_stacks())
+        report = self.report()
+        with open(os.path.join(self.output_dir, "report.txt"), "w", encoding="utf-8") as f:
+            f.write(report)
+        return report
+
+
+def _safe_name(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
@@ -0,0 +1,67 @@
+import time
+from unittest.mock import patch
+import pandas as pd
+import pytest
+from ipl_sentiment_betting.core.analyzer import MatchAnalyzer
+from ipl_sentiment_betting.core.records import Chunk, Comment, Match
+from ipl_sentiment_betting.core.scheduler import LLMScheduler
+from ipl_sentiment_betting.utils.config import Config
+
+class FakeAnalyzer:
+    """
+    Stands in for MatchAnalyzer without touching the model API.
+
+    Covers the per-interval calls live mode makes and the whole-match calls
+    the daemon makes. replies maps a generate_match_update call number to
+    the update it returns instead of the default.
+    """
+
+    def __init__(self):
+        self.delay = 0.0
+        self.replies = {}
+        self.histories = []
+        self.calls = []
+
+    def summarize_chunk(self, chunk, team1_info, team2_info):
+        return {
+            "ball_by_ball_summary": f"{len(chunk.balls)} balls",
+            "odds_summary": f"{len(chunk.odds)} odds",
+            "sentiment_data": {"summary": f"{len(chunk.comments)} comments"},
+        }
+
+    def generate_match_update(self, ball_summary, odds_summary, sentiment_data, team1_name, team2_name, match_history=[], options=None):
+        self.histories.append(list(match_history))
+        time.sleep(self.delay)
+        return self.replies.get(len(self.histories) - 1, f"update after {len(match_history)}")
+
+    def process_match_data(self, match_data, team1_info, team2_info, checkpoint=None, profiler=None):
+        self.calls.append(("interval", match_data))
+        return pd.DataFrame([{
+            "chunk_id": chunk.name, "ball_by_ball_summary": "balls", "odds_summary": "odds",
+            "sentiment_summary": "sentiment", "analysis_update": "update",
+        } for chunk in match_data.chunks])
+
+    def process_match_backfill(self, match_data, team1_info, team2_info, max_batch=None, checkpoint=None, profiler=None):
+        self.calls.append(("backfill", max_batch))
+        return self.process_match_data(match_data, team1_info, team2_info)
+
+@pytest.fixture
+def fake_analyzer():
+    return FakeAnalyzer()
+
+@pytest.fixture
+def analyzer():
+    """A MatchAnalyzer with the model client mocked and a scheduler that never waits."""
+    with patch('ipl_sentiment_betting.core.analyzer.genai'), \
+         patch.object(Config, 'validate'), \
+         patch('ipl_sentiment_betting.core.analyzer.SentimentAnalyzer') as sentiment:
+        sentiment.return_value.get_sentiment_score.return_value = 0.2
+        yield MatchAnalyzer(scheduler=LLMScheduler(requests_per_minute=60000))
+
+@pytest.fixture
+def make_match():
+    """Builds a Match of intervals c0, c1, ... with one comment each."""
+    def make(intervals=3, match_id="1"):
+        chunks = [Chunk(f"c{i}", 0, 0, comments=[Comment(0, f"comment {i}", 1)]) for i in range(intervals)]
+        return Match(match_id, {"name": "Team A", "xi": []}, {"name": "Team B", "xi": []}, chunks)
+    return make
@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import MagicMock, patch
 from ipl_sentiment_betting.core.analyzer import MatchAnalyzer
+from ipl_sentiment_betting.analysis.windows import SentimentTimeline
+from ipl_sentiment_betting.core.records import Ball, Chunk, Comment, OddsSnapshot
 
 @pytest.fixture
 def mock_genai():
@@ -28,10 +30,10 @@ def test_analyzer_initialization(mock_genai, mock_config, mock_sentiment_analyze
 
 def test_format_odds_valid(mock_sentiment_analyzer):
     analyzer = MatchAnalyzer()
-    odds_data = [{
+    odds_data = [OddsSnapshot.from_dict({
         "odds": [{"name": "Team A", "price": 1.5}, {"name": "Team B", "price": 2.5}],
-        "last_update": "10:00"
-    }]
+        "last_update": "2024-03-22 10:00:00 PM IST"
+    })]
     result = analyzer.format_odds(odds_data)
     assert "Team A: 1.5" in result
     assert "Team B: 2.5" in result
@@ -39,7 +41,7 @@ def test_format_odds_valid(mock_sentiment_analyzer):
 
 def test_summarize_ball_by_ball_metrics(mock_sentiment_analyzer):
     analyzer = MatchAnalyzer()
-    balls_data = [
+    balls_data = [Ball.from_dict(b) for b in [
         {
             "ball": "0.1",
             "score": {"runs": 4, "four": True, "ball": True, "name": "Four"},
@@ -54,7 +56,7 @@ def test_summarize_ball_by_ball_metrics(mock_sentiment_analyzer):
             "bowler": {"fullname": "Player B"},
             "name": "Team A"
         }
-    ]
+    ]]
     team1_info = {"name": "Team A", "xi": ["Player A"]}
     team2_info = {"name": "Team B", "xi": ["Player B"]}
     
@@ -71,7 +73,7 @@ def test_summarize_ball_by_ball_metrics(mock_sentiment_analyzer):
 
 def test_analyze_sentiment(mock_sentiment_analyzer):
     analyzer = MatchAnalyzer()
-    comments = [{"comment": "Great shot!"}, {"comment": "Bad luck."}]
+    comments = [Comment.from_dict(c) for c in [{"comment": "Great shot!"}, {"comment": "Bad luck."}]]
     
     # Mock return values for the loop
     analyzer.sentiment_analyzer.get_sentiment_score.side_effect = [0.8, -0.6]
@@ -83,3 +85,24 @@ def test_analyze_sentiment(mock_sentiment_analyzer):
     assert "Negative" in result["summary"]
     assert "Great shot!" in result["top_positive"]
     assert "Bad luck." in result["top_negative"]
+
+def test_summarize_sentiment_windows(mock_sentiment_analyzer):
+    analyzer = MatchAnalyzer()
+    wicket = Ball.from_dict({
+        "ball": "3.2", "updated_at": "2024-03-22 08:02:00 PM",
+        "score": {"name": "Catch Out", "is_wicket": True, "ball": True, "out": True},
+        "batsman": {"fullname": "Player A"}, "bowler": {"fullname": "Player B"}, "name": "Team A"
+    })
+    chunk = Chunk("chunk_1", wicket.timestamp - 120, wicket.timestamp + 180, balls=[wicket])
+    timeline = SentimentTimeline(
+        [wicket.timestamp + offset for offset in (-90, -30, 30, 90, 240)],
+        [0.6, 0.4, -0.7, -0.5, 0.9],
+    )
+
+    result = analyzer.summarize_sentiment_windows(chunk, timeline)
+
+    assert result["trend"] == "Per 60s: +0.60, +0.40, -0.70, -0.50, n/a"
+    # The comment after the interval closes is not counted.
+    assert result["reactions"] == (
+        "- WICKET at 3.2 (Player A): +0.50 -> -0.60 (change -1.10; 2 comments before, 2 after)"
+    )
@@ -0,0 +1,106 @@
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+from ipl_sentiment_betting.core import analyzer as analyzer_module
+from ipl_sentiment_betting.core.batching import BATCH_THINKING_TOKENS, parse_batch_response, plan_batches
+from ipl_sentiment_betting.utils.config import Config
+
+def test_plan_batches_respects_budgets():
+    # After the thinking reserve, 4000 response tokens allow four intervals per request.
+    assert plan_batches([100] * 10, max_input_tokens=100000, max_output_tokens=BATCH_THINKING_TOKENS + 4000) == [
+        [0, 1, 2, 3], [4, 5, 6, 7], [8, 9]
+    ]
+    # Input budget: 1000 overhead + 3 x 3000 fits, a fourth does not.
+    assert plan_batches([3000] * 5, max_input_tokens=10000, max_output_tokens=100000) == [
+        [0, 1, 2], [3, 4]
+    ]
+    # An oversized interval still gets a request of its own.
+    assert plan_batches([50000, 10], max_input_tokens=10000, max_output_tokens=100000) == [[0], [1]]
+    assert plan_batches([10] * 5, max_input_tokens=100000, max_output_tokens=100000, max_intervals=2) == [
+        [0, 1], [2, 3], [4]
+    ]
+
+def test_parse_batch_response_validates_entries():
+    text = json.dumps([
+        {"interval_id": "a", "update": "A update"},
+        {"interval_id": "b", "update": "  "},
+        {"interval_id": "x", "update": "unrequested"},
+        {"interval_id": "a", "update": "duplicate"},
+    ])
+    assert parse_batch_response(text, ["a", "b"]) == {"a": "A update"}
+    assert parse_batch_response("not json", ["a"]) == {}
+    assert parse_batch_response('[{"interval_id": "a"}]', ["a"]) == {}
+
+@pytest.fixture
+def submitted(analyzer):
+    """The JobOptions of every request the analyzer submits."""
+    options = []
+    submit = analyzer.scheduler.submit
+
+    def spy(call, prompt, job_options=None):
+        options.append(job_options)
+        return submit(call, prompt, job_options)
+
+    with patch.object(analyzer.scheduler, 'submit', side_effect=spy):
+        yield options
+
+def test_backfill_batches_and_falls_back_per_interval(analyzer, make_match):
+    match = make_match(3)
+
+    batched = MagicMock(text=json.dumps([
+        {"interval_id": "c0", "update": "batched c0"},
+        {"interval_id": "c2", "update": "batched c2"},
+    ]))
+    single = MagicMock(text="single c1")
+    analyzer.generative_model.generate_content.side_effect = [batched, single]
+
+    df = analyzer.process_match_backfill(match, match.team1_info, match.team2_info)
+
+    assert list(df["chunk_id"]) == ["c0", "c1", "c2"]
+    assert list(df["analysis_update"]) == ["batched c0", "single c1", "batched c2"]
+    assert analyzer.generative_model.generate_content.call_count == 2
+
+def test_backfill_splits_truncated_batches(analyzer, make_match):
+    match = make_match(4)
+
+    def response(*ids):
+        return MagicMock(text=json.dumps([{"interval_id": i, "update": f"batched {i}"} for i in ids]))
+
+    truncated = MagicMock(text='[{"interval_id": "c0", "upd')
+    truncated.candidates[0].finish_reason = analyzer_module.genai.protos.Candidate.FinishReason.MAX_TOKENS
+    analyzer.generative_model.generate_content.side_effect = [truncated, response("c0", "c1"), response("c2", "c3")]
+
+    df = analyzer.process_match_backfill(match, match.team1_info, match.team2_info)
+
+    assert list(df["analysis_update"]) == ["batched c0", "batched c1", "batched c2", "batched c3"]
+    assert analyzer.generative_model.generate_content.call_count == 3
+    # The second half is sent with the first half's updates as its history.
+    assert "batched c1" in analyzer.generative_model.generate_content.call_args.args[0]
+
+def test_historical_requests_are_not_coalesced(analyzer, make_match, submitted):
+    # Two jobs for the same match must not supersede each other's intervals.
+    match = make_match(2)
+    analyzer.generative_model.generate_content.return_value = MagicMock(text="update")
+    analyzer.process_match_data(match, match.team1_info, match.team2_info)
+    analyzer.process_match_backfill(match, match.team1_info, match.team2_info)
+
+    assert len(submitted) >= 3
+    assert all(options.key is None for options in submitted)
+
+def test_failed_updates_are_left_out_of_the_history(analyzer, make_match):
+    match = make_match(3)
+    analyzer.generative_model.generate_content.side_effect = [
+        MagicMock(text="update c0"), RuntimeError("quota exceeded"), MagicMock(text="update c2"),
+    ]
+
+    df = analyzer.process_match_data(match, match.team1_info, match.team2_info)
+
+    assert df["analysis_update"][1].startswith("Error:")
+    last_prompt = analyzer.generative_model.generate_content.call_args.args[0]
+    assert "update c0" in last_prompt and "Error:" not in last_prompt
+
+def test_batched_requests_are_costed_with_the_batch_output_limit(analyzer, submitted):
+    analyzer.generative_model.generate_content.return_value = MagicMock(text="[]")
+    analyzer.generate_batch_updates("prompt", ["c0"])
+
+    assert submitted[0].max_output_tokens == Config.LLM_BATCH_OUTPUT_TOKENS
@@ -0,0 +1,69 @@
+import json
+from unittest.mock import MagicMock
+import pytest
+from ipl_sentiment_betting.core.checkpoint import CheckpointLog, interval_input_hash
+
+def _row(chunk_id, update):
+    return {"chunk_id": chunk_id, "ball_by_ball_summary": "balls", "odds_summary": "odds",
+            "sentiment_summary": "sentiment", "sentiment_reactions": "", "analysis_update": update}
+
+def test_checkpoint_log_round_trip(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    with CheckpointLog(path) as log:
+        log.record("1", "h1", _row("chunk_1", "first"))
+        log.record("1", "h2", _row("chunk_2", "Error: Could not generate a summary from the AI model."))
+    # Simulate a crash mid-write.
+    with open(path, "ab") as f:
+        f.write(b'{"match_id": "1", "input_ha')
+
+    log = CheckpointLog(path)
+    assert log.get("1", "chunk_1", "h1") == _row("chunk_1", "first")
+    assert log.get("1", "chunk_1", "changed") is None
+    assert log.get("1", "chunk_2", "h2") is None  # failures are retried
+    log.record("1", "h3", _row("chunk_3", "third"))
+    log.close()
+    assert len(CheckpointLog(path)) == 2
+
+def test_interval_input_hash_is_stable():
+    assert interval_input_hash("A", "B", ["x", "y"]) == interval_input_hash("A", "B", ["x", "y"])
+    assert interval_input_hash("A", "B", ["x", "y"]) != interval_input_hash("A", "B", ["xy"])
+
+def test_resume_skips_finished_intervals(analyzer, make_match, tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    match = make_match(match_id="9")
+    model = analyzer.generative_model.generate_content
+
+    # The first run dies on the third interval.
+    model.side_effect = [MagicMock(text="u0"), MagicMock(text="u1"), KeyboardInterrupt()]
+    with pytest.raises(KeyboardInterrupt), CheckpointLog(path) as log:
+        analyzer.process_match_data(match, match.team1_info, match.team2_info, checkpoint=log)
+
+    model.reset_mock()
+    model.side_effect = [MagicMock(text="u2")]
+    with CheckpointLog(path) as log:
+        df = analyzer.process_match_data(match, match.team1_info, match.team2_info, checkpoint=log)
+
+    assert list(df["analysis_update"]) == ["u0", "u1", "u2"]
+    assert model.call_count == 1
+    # The narrative history was restored for the remaining interval.
+    assert "u1" in model.call_args[0][0]
+
+def test_backfill_resumes_from_checkpoint(analyzer, make_match, tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    match = make_match(match_id="9")
+    # A previous run finished the first interval.
+    with CheckpointLog(path) as log:
+        local = analyzer.summarize_chunk(match.chunks[0], match.team1_info, match.team2_info,
+                                         analyzer.build_timeline(match))
+        log.record("9", analyzer.interval_hash(local, "Team A", "Team B"), analyzer.build_result_row("c0", local, "u0"))
+
+    model = analyzer.generative_model.generate_content
+    model.side_effect = [MagicMock(text=json.dumps([
+        {"interval_id": "c1", "update": "u1"}, {"interval_id": "c2", "update": "u2"},
+    ]))]
+    with CheckpointLog(path) as log:
+        df = analyzer.process_match_backfill(match, match.team1_info, match.team2_info, checkpoint=log)
+
+    assert list(df["analysis_update"]) == ["u0", "u1", "u2"]
+    assert model.call_count == 1
+    assert "c0" not in model.call_args[0][0].split("### Consecutive Interval Data")[1]
@@ -0,0 +1,69 @@
+import json
+import pytest
+from ipl_sentiment_betting.utils import codec
+
+CHUNK_FILE = {
+    "match_info": {"team1": {"name": "Team A", "xi": []}, "team2": {"name": "Team B", "xi": []}},
+    "chunks": [
+        {
+            "name": "chunk_1",
+            "start_time": "2024-03-22 08:04:49 PM",
+            "end_time": "2024-03-22 08:10:19 PM",
+            "is_pregame": False,
+            "is_innings_break": False,
+            "balls": [{
+                "ball": 0.3,
+                "updated_at": "2024-03-22 08:05:34 PM IST",
+                "id": 8,
+                "name": "Team A",
+                "score": {"name": "No Run", "runs": 0, "four": False, "six": False, "bye": 0,
+                          "leg_bye": 0, "is_wicket": False, "ball": True, "out": False},
+                "batsman": {"id": 75, "fullname": "Player A", "battingstyle": "right-hand-bat"},
+                "bowler": {"id": 279, "fullname": "Player B", "bowlingstyle": "right-arm-fast-medium"},
+            }],
+            "comments": [{"timestamp": "2024-03-22 08:04:50 PM", "comment": "nice", "upvotes": 4}],
+            "odds": [{"last_update": "2024-03-22 08:04:49 PM IST",
+                      "odds": [{"name": "Team A", "price": 1.87}, {"name": "Team B", "price": 1.95}]}],
+        },
+    ],
+}
+
+def test_decode_chunk_file_is_typed():
+    document = codec.decode(json.dumps(CHUNK_FILE, indent=4), codec.ChunkFile)
+    chunk = document.chunks[0]
+    assert document.match_info.team1.name == "Team A"
+    assert chunk.balls[0].score.ball is True
+    assert chunk.balls[0].batsman.fullname == "Player A"
+    assert chunk.comments[0].upvotes == 4
+    assert chunk.odds[0].odds[1].price == 1.95
+
+def test_decode_rejects_invalid_documents():
+    bad = json.loads(json.dumps(CHUNK_FILE))
+    bad["chunks"][0]["balls"][0]["score"]["runs"] = "four"
+    with pytest.raises(codec.ValidationError):
+        codec.decode(json.dumps(bad), codec.ChunkFile)
+    with pytest.raises(codec.DecodeError):
+        codec.decode(b"{not json", codec.ChunkFile)
+
+def test_encode_round_trip_is_compact(tmp_path):
+    document = codec.decode(json.dumps(CHUNK_FILE), codec.ChunkFile)
+    path = tmp_path / "1.json"
+    codec.write_json(path, document)
+
+    raw = path.read_bytes()
+    assert b"\n" not in raw and b": " not in raw
+    assert json.loads(raw) == CHUNK_FILE
+    assert len(raw) < len(json.dumps(CHUNK_FILE, indent=4))
+    assert codec.read_json(path, codec.ChunkFile) == document
+
+def test_trimmed_odds_from_raw_snapshots():
+    raw = [{
+        "timestamp": "2024-03-22T14:30:00Z",
+        "odds": {"timestamp": "2024-03-22T14:25:39Z", "data": {"id": "x", "bookmakers": [{
+            "key": "fanduel", "last_update": "2024-03-22T14:25:30Z",
+            "markets": [{"key": "h2h", "outcomes": [{"name": "Team A", "price": 1.75}]}],
+        }]}},
+    }]
+    entries = codec.decode(json.dumps(raw), codec.HistoricalOddsFile)
+    bookmaker = entries[0].odds.data.bookmakers[0]
+    assert bookmaker.markets[0].outcomes[0] == codec.Outcome("Team A", 1.75)
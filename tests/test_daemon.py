@@ -0,0 +1,89 @@
+import threading
+import pytest
+from ipl_sentiment_betting.core.daemon import AnalysisDaemon, request_analysis, send_request
+from ipl_sentiment_betting.utils import codec
+
+@pytest.fixture
+def daemon(tmp_path, fake_analyzer):
+    daemon = AnalysisDaemon(str(tmp_path / "d.sock"), analyzer=fake_analyzer)
+    daemon.start()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield daemon
+    daemon.shutdown()
+    thread.join(5)
+
+@pytest.fixture
+def match_file(tmp_path):
+    path = tmp_path / "7.json"
+    codec.write_json(path, {
+        "match_info": {"team1": {"name": "Team A"}, "team2": {"name": "Team B"}},
+        "chunks": [{"name": "chunk_1"}, {"name": "chunk_2"}],
+    })
+    return str(path)
+
+def test_daemon_serves_jobs_with_warm_state(daemon, match_file, tmp_path):
+    output = str(tmp_path / "7.md")
+
+    response = request_analysis(match_file, output, socket_path=daemon.socket_path)
+    assert response.ok and response.intervals == 2
+    assert "## Interval: chunk_2" in open(output).read()
+
+    response = request_analysis(match_file, output, backfill=True, batch_size=4, socket_path=daemon.socket_path)
+    assert response.ok
+    # The second job reuses the parsed match and the same analyzer.
+    assert daemon.analyzer.calls[0][1] is daemon.analyzer.calls[2][1]
+    assert daemon.analyzer.calls[1] == ("backfill", 4)
+
+    assert send_request(codec.DaemonRequest("ping"), daemon.socket_path).message.startswith("pong (2 jobs")
+
+def test_daemon_reports_errors(daemon, tmp_path):
+    response = request_analysis(str(tmp_path / "missing.json"), str(tmp_path / "out.md"),
+                                socket_path=daemon.socket_path)
+    assert not response.ok
+    assert not send_request(codec.DaemonRequest("reboot"), daemon.socket_path).ok
+
+def test_client_without_daemon_raises(tmp_path):
+    with pytest.raises(OSError):
+        request_analysis("in.json", "out.md", socket_path=str(tmp_path / "none.sock"))
+
+def test_default_socket_is_private(tmp_path, monkeypatch, fake_analyzer):
+    import os
+    import stat
+    import tempfile
+    from ipl_sentiment_betting.utils.config import Config
+
+    monkeypatch.setattr(Config, "DAEMON_SOCKET", None)
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+    daemon = AnalysisDaemon(analyzer=fake_analyzer)
+    daemon.start()
+    try:
+        directory = os.path.dirname(daemon.socket_path)
+        assert directory == str(tmp_path / f"ipl-analyze-{os.getuid()}")
+        assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+        assert stat.S_IMODE(os.stat(daemon.socket_path).st_mode) & 0o077 == 0
+    finally:
+        daemon._server.server_close()
+
+    # A default directory others can write to is refused by server and client.
+    os.chmod(directory, 0o777)
+    with pytest.raises(PermissionError):
+        AnalysisDaemon(analyzer=fake_analyzer).start()
+    with pytest.raises(PermissionError):
+        send_request(codec.DaemonRequest("ping"))
+
+def test_daemon_reports_unwritable_output(daemon, match_file, tmp_path, monkeypatch):
+    from ipl_sentiment_betting.main import main
+
+    output = str(tmp_path / "missing_dir" / "7.md")
+    response = request_analysis(match_file, output, socket_path=daemon.socket_path)
+    assert not response.ok
+    assert "missing_dir" in response.message
+
+    # --client exits non-zero instead of printing a success line.
+    monkeypatch.setattr("sys.argv", ["ipl-analyze", match_file, output, "--client", "--socket", daemon.socket_path])
+    with pytest.raises(SystemExit) as exc:
+        main()
+    assert exc.value.code == 1
@@ -0,0 +1,76 @@
+import pytest
+from unittest.mock import MagicMock
+from ipl_sentiment_betting.analysis.features import FeatureStore, build_feature_rows
+from ipl_sentiment_betting.core.records import Ball, Chunk, Comment, Match, OddsSnapshot
+
+def _ball(runs, valid=True, four=False, wicket=False, team="Royal Challengers Bengaluru"):
+    return Ball(0.1, 0, 8, team, "Run", runs, four, False, 0, 0, wicket, valid, wicket,
+                1, "Batter", 2, "Bowler")
+
+def _odds(rcb, csk):
+    return [OddsSnapshot(0, (("Chennai Super Kings", csk), ("Royal Challengers Bangalore", rcb)))]
+
+@pytest.fixture
+def match():
+    chunks = [
+        Chunk("chunk_1", 100, 200, is_pregame=True, comments=[Comment(150, "lets go", 4)],
+              odds=_odds(2.0, 1.8)),
+        Chunk("chunk_2", 200, 300, balls=[_ball(0), _ball(0), _ball(4, four=True), _ball(0, wicket=True)],
+              comments=[Comment(250, "ugh", 0), Comment(260, "[deleted]", 9)], odds=[]),
+        Chunk("chunk_3", 300, 400, balls=[_ball(1), _ball(0)], odds=_odds(2.4, 1.6)),
+    ]
+    return Match("7", {"name": "Royal Challengers Bengaluru", "xi": []},
+                 {"name": "Chennai Super Kings", "xi": []}, chunks)
+
+@pytest.fixture
+def sentiment_analyzer():
+    analyzer = MagicMock()
+    analyzer.get_sentiment_score.side_effect = lambda text: {"lets go": 0.6, "ugh": -0.4}[text]
+    return analyzer
+
+def test_build_feature_rows(match, sentiment_analyzer):
+    rows = build_feature_rows(match, sentiment_analyzer)
+
+    assert [r["chunk_name"] for r in rows] == ["chunk_1", "chunk_2", "chunk_3"]
+    second = rows[1]
+    assert second["valid_balls"] == 4
+    assert second["dot_pct"] == 50.0
+    assert second["wickets"] == 1
+    assert second["comment_count"] == 1
+    assert second["sentiment_avg"] == -0.4
+    assert second["team1_price"] is None
+
+    # Deltas carry across the interval without odds; names are matched across sources.
+    third = rows[2]
+    assert third["team1_price"] == 2.4
+    assert third["team1_price_delta"] == 0.4
+    assert third["team2_price_delta"] == -0.2
+    assert third["batting_price_delta"] == 0.4
+    assert rows[0]["batting_team"] is None
+
+def test_feature_store_query(tmp_path, match, sentiment_analyzer):
+    with FeatureStore(str(tmp_path / "features.db")) as store:
+        store.write_match(build_feature_rows(match, sentiment_analyzer))
+        # Rewriting a match replaces its rows rather than duplicating them.
+        store.write_match(build_feature_rows(match, sentiment_analyzer))
+
+        assert store.match_ids() == ["7"]
+        assert len(store.query()) == 3
+
+        rows = store.query(ranges={"dot_pct": (50, None), "sentiment_avg": (None, -0.2)})
+        assert [r["chunk_name"] for r in rows] == ["chunk_2"]
+
+        rows = store.query(conditions=[("batting_price_delta", ">", 0)])
+        assert [r["chunk_name"] for r in rows] == ["chunk_3"]
+
+        rows = store.query(order_by="run_rate", descending=True, limit=1)
+        assert rows[0]["chunk_name"] == "chunk_2"
+
+def test_feature_store_rejects_unknown_columns(tmp_path):
+    with FeatureStore(str(tmp_path / "features.db")) as store:
+        with pytest.raises(ValueError):
+            store.query(ranges={"dot_pct; DROP TABLE features": (0, 1)})
+        with pytest.raises(ValueError):
+            store.query(conditions=[("dot_pct", "!=", 1)])
+        with pytest.raises(ValueError):
+            store.query(order_by="nonsense")
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import pytest
+from ipl_sentiment_betting.core.live import (
+    END_MARKER, LiveSession, load_feed_match_info, replay_match, tail_jsonl
+)
+from ipl_sentiment_betting.utils import codec
+
+def _ball(ts):
+    return {"ball": 0.1, "updated_at": ts, "id": 1, "name": "Team A",
+            "score": {"name": "1 Run", "runs": 1, "ball": True},
+            "batsman": {"fullname": "Player A"}, "bowler": {"fullname": "Player B"}}
+
+@pytest.fixture
+def match_file(tmp_path):
+    # Three five-minute intervals of match time starting at 08:00:00 PM.
+    data = {
+        "match_info": {"team1": {"name": "Team A", "xi": []}, "team2": {"name": "Team B", "xi": []}},
+        "chunks": [{
+            "name": "chunk_1",
+            "balls": [_ball("2024-03-22 08:01:00 PM IST"), _ball("2024-03-22 08:06:00 PM IST")],
+            "comments": [
+                {"timestamp": "2024-03-22 08:00:00 PM", "comment": "first", "upvotes": 1},
+                {"timestamp": "2024-03-22 08:04:59 PM", "comment": "second", "upvotes": 0},
+                {"timestamp": "2024-03-22 08:12:00 PM", "comment": "third", "upvotes": 2},
+            ],
+            "odds": [{"last_update": "2024-03-22 08:02:00 PM IST", "odds": [{"name": "Team A", "price": 1.9}]}],
+        }],
+    }
+    path = tmp_path / "1.json"
+    path.write_text(json.dumps(data))
+    return path
+
+def test_replay_writes_feeds(match_file, tmp_path):
+    feeds = tmp_path / "feeds"
+    count = asyncio.run(replay_match(str(match_file), str(feeds), speed=1e6))
+
+    assert count == 6
+    assert (feeds / END_MARKER).exists()
+    assert len((feeds / "comments.jsonl").read_text().splitlines()) == 3
+    team1, team2 = load_feed_match_info(str(feeds))
+    assert team1["name"] == "Team A" and team2["name"] == "Team B"
+
+def test_live_session_replays_intervals(match_file, fake_analyzer, tmp_path):
+    feeds = tmp_path / "feeds"
+    analyzer = fake_analyzer
+    emitted = []
+
+    async def run():
+        # 720 match seconds of events at 1200x is ~0.6s of wall time.
+        session = LiveSession(analyzer, str(feeds), {"name": "Team A"}, {"name": "Team B"},
+                              interval_seconds=300, speed=1200, latency_budget=5,
+                              poll_interval=0.01, on_signal=emitted.append)
+        await asyncio.gather(replay_match(str(match_file), str(feeds), speed=1200), session.run())
+        return session
+
+    session = asyncio.run(run())
+
+    assert [r["chunk_id"] for r in emitted] == ["interval_1", "interval_2", "interval_3"]
+    assert [r["sentiment_summary"] for r in emitted] == ["2 comments", "0 comments", "1 comments"]
+    assert [r["ball_by_ball_summary"] for r in emitted] == ["1 balls", "1 balls", "0 balls"]
+    assert emitted[0]["odds_summary"] == "1 odds"
+    # Narrative history is threaded from one interval to the next.
+    assert analyzer.histories == [[], ["update after 0"], ["update after 0", "update after 1"]]
+    assert len(session.latency.samples) == 3
+    assert max(session.latency.samples) < 5
+
+def test_live_session_enforces_latency_budget(match_file, fake_analyzer, tmp_path):
+    feeds = tmp_path / "feeds"
+    asyncio.run(replay_match(str(match_file), str(feeds), speed=1e6))
+    analyzer = fake_analyzer
+    analyzer.delay = 0.5
+
+    session = LiveSession(analyzer, str(feeds), {"name": "Team A"}, {"name": "Team B"},
+                          speed=1e6, latency_budget=0.1, poll_interval=0.01)
+    results = asyncio.run(session.run())
+
+    assert len(results) == 3
+    assert all("latency budget" in r["analysis_update"] for r in results)
+    assert all(r["latency_seconds"] < 0.5 for r in results)
+
+def test_live_session_catches_up_on_past_intervals(match_file, fake_analyzer, tmp_path):
+    # At speed 1 the feed timestamps are real time: a session started long
+    # after these intervals ended closes them at once and skips the model.
+    feeds = tmp_path / "feeds"
+    asyncio.run(replay_match(str(match_file), str(feeds), speed=1e6))
+    (feeds / END_MARKER).unlink()
+    analyzer = fake_analyzer
+
+    async def run():
+        session = LiveSession(analyzer, str(feeds), {"name": "Team A"}, {"name": "Team B"},
+                              latency_budget=5, poll_interval=0.01)
+        task = asyncio.create_task(session.run())
+        # The feeds are still open, so only the clock can close the intervals.
+        for _ in range(100):
+            if len(session.results) == 3:
+                break
+            await asyncio.sleep(0.01)
+        (feeds / END_MARKER).touch()
+        await task
+        return session
+
+    session = asyncio.run(run())
+
+    assert [r["chunk_id"] for r in session.results] == ["interval_1", "interval_2", "interval_3"]
+    assert analyzer.histories == []
+    assert all("latency budget" in r["analysis_update"] for r in session.results)
+    assert all(r["latency_seconds"] > 3600 for r in session.results)
+
+def test_tail_jsonl_waits_for_complete_lines(tmp_path):
+    path = tmp_path / "comments.jsonl"
+    done = tmp_path / END_MARKER
+
+    async def produce():
+        await asyncio.sleep(0.02)
+        with open(path, "ab") as f:
+            f.write(b'{"comment": "a", "upvotes": 1}\n{"comment": "b", "up')
+            f.flush()
+            await asyncio.sleep(0.05)
+            f.write(b'votes": 2}\nnot json\n')
+        done.touch()
+
+    async def consume():
+        return [item async for item in tail_jsonl(path, codec.CommentEntry, 0.01, done.exists)]
+
+    async def run():
+        _, items = await asyncio.gather(produce(), consume())
+        return items
+
+    items = asyncio.run(run())
+    assert [(c.comment, c.upvotes) for c in items] == [("a", 1), ("b", 2)]
+
+def test_run_live_follows_several_matches_in_one_process(match_file, fake_analyzer, tmp_path):
+    from argparse import Namespace
+    from ipl_sentiment_betting.main import run_live
+
+    for name in ("a", "b"):
+        asyncio.run(replay_match(str(match_file), str(tmp_path / name), speed=1e6))
+    analyzer = fake_analyzer
+    args = Namespace(input_path=str(tmp_path / "a"), output_path=str(tmp_path / "a.md"),
+                     also=[[str(tmp_path / "b"), str(tmp_path / "b.md")]],
+                     interval=300.0, speed=1e6, latency_budget=5.0)
+
+    run_live(analyzer, args)
+
+    # Both matches went through the one analyzer.
+    assert len(analyzer.histories) == 6
+    for name in ("a", "b"):
+        assert (tmp_path / f"{name}.md").read_text().count("## Interval:") == 3
+
+def test_failed_updates_are_left_out_of_the_history(match_file, fake_analyzer, tmp_path):
+    feeds = tmp_path / "feeds"
+    asyncio.run(replay_match(str(match_file), str(feeds), speed=1e6))
+    analyzer = fake_analyzer
+    analyzer.replies[0] = "Skipped: the interval went stale."
+
+    session = LiveSession(analyzer, str(feeds), {"name": "Team A"}, {"name": "Team B"},
+                          speed=1e6, latency_budget=5, poll_interval=0.01)
+    results = asyncio.run(session.run())
+
+    assert results[0]["analysis_update"].startswith("Skipped:")
+    assert analyzer.histories == [[], [], ["update after 0"]]
@@ -0,0 +1,41 @@
+import os
+import time
+from ipl_sentiment_betting.utils.profiling import NULL_PROFILER, Profiler
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(100))
+
+def test_profiler_collects_stages_memory_and_stacks(tmp_path):
+    profiler = Profiler(str(tmp_path / "profile"), top_n=5, sample_interval=0.001)
+    with profiler:
+        with profiler.interval("chunk_1"):
+            with profiler.stage("summarize"):
+                _busy(0.05)
+                with profiler.stage("model"):
+                    kept = [bytearray(1024) for _ in range(1024)]
+        with profiler.interval("chunk_2"), profiler.stage("summarize"):
+            _busy(0.02)
+
+    assert len(profiler.stage_times["summarize"]) == 2
+    assert len(profiler.stage_times["model"]) == 1
+    assert [label for label, _, _ in profiler.interval_memory] == ["chunk_1", "chunk_2"]
+    peak, retained = profiler.interval_memory[0][1:]
+    assert peak >= 1024 * 1024 and retained >= 1024 * 1024
+
+    stacks = profiler.collapsed_stacks().splitlines()
+    assert any(line.startswith("summarize;") and "_busy" in line for line in stacks)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
+
+    report = profiler.write()
+    assert "summarize" in report and "Top 5 functions by own time" in report
+    assert sorted(os.listdir(tmp_path / "profile")) == [
+        "model.prof", "report.txt", "stacks.collapsed", "summarize.prof"
+    ]
+    del kept
+
+def test_null_profiler_is_a_no_op():
+    with NULL_PROFILER.interval("chunk_1"), NULL_PROFILER.stage("summarize"):
+        pass
+    assert not NULL_PROFILER.enabled
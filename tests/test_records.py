@@ -0,0 +1,69 @@
+import json
+from ipl_sentiment_betting.core.records import (
+    Ball, Chunk, Comment, Match, OddsSnapshot, format_timestamp, load_match, parse_timestamp
+)
+
+def test_parse_timestamp_formats():
+    ist = parse_timestamp("2024-03-22 08:04:50 PM")
+    assert ist == parse_timestamp("2024-03-22 08:04:50 PM IST")
+    assert ist == parse_timestamp("2024-03-22T14:34:50Z")
+    assert ist == parse_timestamp("2024-03-22T14:34:50+00:00")
+    assert ist == parse_timestamp("2024-03-22T14:34:50.000000Z")
+    assert parse_timestamp("not a time") == 0
+    assert parse_timestamp(None) == 0
+
+def test_format_timestamp_round_trip():
+    ts = parse_timestamp("2024-03-22 08:04:49 PM IST")
+    assert format_timestamp(ts) == "2024-03-22 08:04:49 PM IST"
+    assert format_timestamp(0) == "unknown time"
+
+def test_ball_names_are_interned():
+    raw = {
+        "ball": 0.3,
+        "updated_at": "2024-03-22 08:05:34 PM IST",
+        "id": 8,
+        "name": "Royal " + "Challengers Bengaluru",
+        "score": {"name": "No Run", "runs": 0, "four": False, "six": False, "bye": 0,
+                  "leg_bye": 0, "is_wicket": False, "ball": True, "out": False},
+        "batsman": {"id": 75, "fullname": "Faf du " + "Plessis"},
+        "bowler": {"id": 279, "fullname": "Deepak Chahar"},
+    }
+    first = Ball.from_dict(raw)
+    second = Ball.from_dict(json.loads(json.dumps(raw)))
+    assert first.team is second.team
+    assert first.batsman is second.batsman
+    assert first.is_valid and not first.is_wicket
+    assert first.timestamp == parse_timestamp("2024-03-22 08:05:34 PM")
+    assert not hasattr(first, "__dict__")
+
+def test_load_match(tmp_path):
+    data = {
+        "match_info": {"team1": {"name": "Team A", "xi": []}, "team2": {"name": "Team B", "xi": []}},
+        "chunks": [
+            {
+                "name": "chunk_1",
+                "start_time": "2024-03-22 07:55:30 PM",
+                "end_time": "2024-03-22 08:00:13 PM",
+                "is_pregame": True,
+                "comments": [{"timestamp": "2024-03-22 07:56:00 PM", "comment": "lets go", "upvotes": 3}],
+                "odds": [{"last_update": "2024-03-22 07:55:30 PM IST",
+                          "odds": [{"name": "Team A", "price": 1.75}, {"name": "Team B", "price": 2.1}]}],
+            },
+            {"start_time": "2024-03-22 08:00:13 PM", "end_time": "2024-03-22 08:04:49 PM"},
+        ],
+    }
+    path = tmp_path / "12.json"
+    path.write_text(json.dumps(data))
+
+    match = load_match(str(path))
+
+    assert isinstance(match, Match)
+    assert match.match_id == "12"
+    assert match.team1_info["name"] == "Team A"
+    first, second = match.chunks
+    assert isinstance(first, Chunk) and first.is_pregame
+    assert isinstance(first.comments[0], Comment) and first.comments[0].upvotes == 3
+    assert isinstance(first.odds[0], OddsSnapshot)
+    assert first.odds[0].prices == (("Team A", 1.75), ("Team B", 2.1))
+    assert second.name == "chunk_2"
+    assert second.balls == [] and second.comments == [] and second.odds == []
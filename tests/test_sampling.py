@@ -0,0 +1,53 @@
+import random
+from ipl_sentiment_betting.analysis.sampling import RepresentativeSampler, sentiment_bucket, truncate_comment
+
+def test_sentiment_bucket_and_truncation():
+    assert [sentiment_bucket(s) for s in (0.6, -0.6, 0.0)] == ["positive", "negative", "neutral"]
+    assert truncate_comment("what  a\nshot") == "what a shot"
+    assert truncate_comment("one two three four", limit=12) == "one two…"
+
+def test_sample_is_stratified_and_deduplicated():
+    sampler = RepresentativeSampler(per_bucket={"positive": 2, "negative": 2, "neutral": 1})
+    for i in range(50):
+        sampler.add(f"great shot {i}", 0.8)
+        sampler.add(f"awful bowling {i}", -0.7)
+        sampler.add(f"next over {i}", 0.0)
+    for _ in range(20):
+        sampler.add("great shot 7", 0.8, upvotes=10**6)  # repeats are never quoted twice
+    sampler.add("ok", 0.9)  # too short to be worth quoting
+
+    sample = sampler.sample()
+    assert len(sample["positive"]) == 2 and len(sample["negative"]) == 2 and len(sample["neutral"]) == 1
+    assert all(text.startswith("great shot") for text in sample["positive"])
+    assert "great shot 7" in sample["positive"] and len(set(sample["positive"])) == 2
+    assert "ok" not in sample["positive"]
+
+def test_upvotes_weight_the_sample():
+    picked = 0
+    for seed in range(50):
+        sampler = RepresentativeSampler(per_bucket={"positive": 1}, rng=random.Random(seed))
+        for i in range(100):
+            sampler.add(f"comment {i}", 0.5, upvotes=500 if i == 42 else 0)
+        picked += sampler.sample()["positive"] == ["comment 42"]
+    # With weight 501 against 99 comments of weight 1, it wins about 83% of the time.
+    assert picked >= 35
+
+def test_character_budgets():
+    sampler = RepresentativeSampler(comment_char_limit=50, total_char_budget=120)
+    for i in range(10):
+        sampler.add(f"brilliant {i} " + "x " * 100, 0.9)
+        sampler.add(f"terrible {i} " + "y " * 100, -0.9)
+    sample = sampler.sample()
+    texts = sample["positive"] + sample["negative"]
+    assert all(len(t) <= 50 for t in texts)
+    assert sum(len(t) for t in texts) <= 120
+    # Round-robin filling keeps both sides represented under a tight budget.
+    assert sample["positive"] and sample["negative"]
+
+def test_sample_is_reproducible():
+    def run():
+        sampler = RepresentativeSampler()
+        for i in range(200):
+            sampler.add(f"comment number {i}", (i % 7 - 3) / 3, upvotes=i % 5)
+        return sampler.sample()
+    assert run() == run()
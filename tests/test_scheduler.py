@@ -0,0 +1,122 @@
+import threading
+import time
+import pytest
+from ipl_sentiment_betting.core.records import Ball, Chunk, OddsSnapshot
+from ipl_sentiment_betting.core.scheduler import (
+    RESPONSE_TOKEN_ALLOWANCE, JobDropped, JobOptions, LLMScheduler, estimate_tokens, interval_priority, match_phase
+)
+
+def _ball(over, runs=0, wicket=False, four=False):
+    return Ball(over, 0, 1, "Team A", "Run", runs, four, False, 0, 0, wicket, True, wicket,
+                1, "Batter", 2, "Bowler")
+
+def _odds(price_a, price_b):
+    return [OddsSnapshot(0, (("Team A", price_a), ("Team B", price_b)))]
+
+def test_match_phase():
+    assert match_phase(Chunk("c", 0, 0, is_pregame=True)) == "pregame"
+    assert match_phase(Chunk("c", 0, 0, is_innings_break=True)) == "innings_break"
+    assert match_phase(Chunk("c", 0, 0, balls=[_ball(2.3)])) == "powerplay"
+    assert match_phase(Chunk("c", 0, 0, balls=[_ball(10.1)])) == "middle"
+    assert match_phase(Chunk("c", 0, 0, balls=[_ball(17.4)])) == "death"
+    # Boundaries: the 6th over is the last of the powerplay, the 16th the first death over.
+    assert match_phase(Chunk("c", 0, 0, balls=[_ball(5.6)])) == "powerplay"
+    assert match_phase(Chunk("c", 0, 0, balls=[_ball(6.1)])) == "middle"
+    assert match_phase(Chunk("c", 0, 0, balls=[_ball(14.6)])) == "middle"
+    assert match_phase(Chunk("c", 0, 0, balls=[_ball(15.1)])) == "death"
+
+def test_interval_priority_ranks_urgent_intervals_first():
+    pregame = Chunk("c", 0, 0, is_pregame=True, odds=_odds(1.9, 1.9))
+    quiet_middle = Chunk("c", 0, 0, balls=[_ball(10.1), _ball(10.2)], odds=_odds(1.9, 1.9))
+    death_wicket = Chunk("c", 0, 0, balls=[_ball(18.1, wicket=True)], odds=_odds(1.9, 1.9))
+    swing = Chunk("c", 0, 0, balls=[_ball(10.3)], odds=_odds(2.2, 1.6))
+
+    assert interval_priority(pregame) < interval_priority(quiet_middle, pregame)
+    assert interval_priority(quiet_middle, pregame) < interval_priority(swing, quiet_middle)
+    assert interval_priority(swing, quiet_middle) < interval_priority(death_wicket, quiet_middle)
+
+def _blocked_scheduler(**kwargs):
+    """A scheduler whose single worker is held busy until the returned event is set."""
+    scheduler = LLMScheduler(**kwargs)
+    release = threading.Event()
+    started = threading.Event()
+
+    def block(prompt):
+        started.set()
+        release.wait(5)
+        return prompt
+
+    first = scheduler.submit(block, "first")
+    assert started.wait(5)
+    return scheduler, release, first
+
+def test_dispatches_by_priority():
+    scheduler, release, first = _blocked_scheduler(requests_per_minute=60000)
+    order = []
+    futures = [
+        scheduler.submit(order.append, name, JobOptions(priority=p))
+        for name, p in [("pregame", 0), ("death", 5), ("middle", 2), ("death2", 5)]
+    ]
+    release.set()
+    for f in futures:
+        f.result(5)
+    assert first.result(5) == "first"
+    assert order == ["death", "death2", "middle", "pregame"]
+
+def test_newer_interval_supersedes_pending_one():
+    scheduler, release, _ = _blocked_scheduler(requests_per_minute=60000)
+    old = scheduler.submit(lambda p: p, "old", JobOptions(priority=2, key="match-1"))
+    urgent = scheduler.submit(lambda p: p, "urgent", JobOptions(priority=9, key="match-1"))
+    other = scheduler.submit(lambda p: p, "other", JobOptions(priority=2, key="match-2"))
+    newer = scheduler.submit(lambda p: p, "newer", JobOptions(priority=3, key="match-1"))
+    release.set()
+
+    with pytest.raises(JobDropped):
+        old.result(5)
+    # Higher-priority pending work for the same match is never coalesced away.
+    assert urgent.result(5) == "urgent"
+    assert other.result(5) == "other"
+    assert newer.result(5) == "newer"
+    assert scheduler.stats["superseded"] == 1
+
+def test_stale_jobs_are_dropped():
+    scheduler, release, _ = _blocked_scheduler(requests_per_minute=60000)
+    stale = scheduler.submit(lambda p: p, "stale", JobOptions(deadline=time.monotonic() + 0.05))
+    fresh = scheduler.submit(lambda p: p, "fresh", JobOptions(deadline=time.monotonic() + 60))
+    time.sleep(0.1)
+    release.set()
+
+    with pytest.raises(JobDropped):
+        stale.result(5)
+    assert fresh.result(5) == "fresh"
+    assert scheduler.stats["stale"] == 1
+
+def test_request_rate_is_enforced():
+    scheduler = LLMScheduler(requests_per_minute=600)  # one request per 0.1s
+    sent = []
+    start = time.monotonic()
+    futures = [scheduler.submit(lambda p: sent.append(time.monotonic()), str(i)) for i in range(4)]
+    for f in futures:
+        f.result(5)
+    assert sent[-1] - start >= 0.29
+
+def test_token_budget_is_enforced():
+    scheduler = LLMScheduler(requests_per_minute=60000, tokens_per_minute=1000)
+    first = scheduler.submit(lambda p: "sent", "x" * 400)  # ~600 estimated tokens
+    assert first.result(5) == "sent"
+    # The window is full for the next minute, so this one goes stale waiting.
+    second = scheduler.submit(lambda p: "sent", "x" * 400, JobOptions(deadline=time.monotonic() + 0.2))
+    with pytest.raises(JobDropped):
+        second.result(5)
+
+def test_token_budget_counts_the_response_limit():
+    assert estimate_tokens("x" * 400) == 100 + RESPONSE_TOKEN_ALLOWANCE
+    assert estimate_tokens("x" * 400, max_output_tokens=16384) == 100 + 16384
+
+    scheduler = LLMScheduler(requests_per_minute=60000, tokens_per_minute=10000)
+    # A small prompt that may produce a 16k-token response takes the whole window.
+    first = scheduler.submit(lambda p: "sent", "x" * 400, JobOptions(max_output_tokens=16384))
+    assert first.result(5) == "sent"
+    second = scheduler.submit(lambda p: "sent", "x" * 400, JobOptions(deadline=time.monotonic() + 0.2))
+    with pytest.raises(JobDropped):
+        second.result(5)
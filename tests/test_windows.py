@@ -0,0 +1,44 @@
+import random
+import pytest
+from ipl_sentiment_betting.analysis.metrics import compute_sentiment_stats
+from ipl_sentiment_betting.analysis.windows import SentimentTimeline
+from ipl_sentiment_betting.core.records import Ball, Comment
+
+def test_window_matches_full_scan():
+    rng = random.Random(7)
+    timestamps = [rng.randrange(0, 3600) for _ in range(500)]
+    scores = [rng.uniform(-1, 1) for _ in timestamps]
+    upvotes = [rng.randrange(-2, 50) for _ in timestamps]
+    timeline = SentimentTimeline(timestamps, scores, upvotes)
+
+    for start, end in [(0, 3600), (100, 160), (1800, 1801), (3000, 2000)]:
+        inside = [i for i, t in enumerate(timestamps) if start <= t < end]
+        expected = compute_sentiment_stats([scores[i] for i in inside], [upvotes[i] for i in inside])
+        assert timeline.window(start, end) == pytest.approx(expected)
+
+def test_rolling_and_reaction():
+    # Calm at +0.5 for two minutes, then -0.5 after a wicket at t=120.
+    timeline = SentimentTimeline(list(range(0, 240, 10)), [0.5] * 12 + [-0.5] * 12)
+
+    assert timeline.rolling(60) == [(60, 0.5), (120, 0.5), (180, -0.5), (240, -0.5)]
+    assert timeline.rolling(60, start=0, end=300)[-1] == (300, None)
+
+    reaction = timeline.reaction(120, before=60, after=60)
+    assert reaction["before"] == pytest.approx(0.5)
+    assert reaction["after"] == pytest.approx(-0.5)
+    assert reaction["delta"] == pytest.approx(-1.0)
+    assert (reaction["before_count"], reaction["after_count"]) == (6, 6)
+    # The reaction window is cut off at `until`.
+    assert timeline.reaction(120, until=150)["after_count"] == 3
+    assert timeline.reaction(500)["delta"] is None
+
+def test_from_comments_and_ball_reactions():
+    comments = [Comment(t, "text", 0) for t in (30, 0, 10, 20)] + [Comment(15, "[deleted]", 0)]
+    timeline = SentimentTimeline.from_comments(comments, lambda text: 0.1)
+    assert timeline.timestamps == [0, 10, 20, 30]
+
+    wicket = Ball(1.1, 15, 1, "A", "Catch Out", 0, False, False, 0, 0, True, True, True, 1, "Bat", 2, "Bowl")
+    dot = Ball(1.2, 25, 1, "A", "No Run", 0, False, False, 0, 0, False, True, False, 1, "Bat", 2, "Bowl")
+    reactions = timeline.ball_reactions([wicket, dot])
+    assert [ball for ball, _ in reactions] == [wicket]
+    assert reactions[0][1]["after_count"] == 2